@@ -516,7 +516,7 @@ with st.sidebar:
     st.metric("Targets Loaded", len(st.session_state.targets))
     st.metric("Ledger Entries", f"{len(filtered_ledger)} / {len(st.session_state.ledger)}")
     st.metric("Filtered Revenue", f"${filtered_revenue:,.0f}")
-    st.metric("Active Rules", len([r for r in st.session_state.rules if r.active]))
+    st.metric("Active Rules", len([r for r in st.session_state.rules.values() if r.active]))
 
     st.markdown("---")
     st.markdown("### 🏗️ Architecture")
@@ -959,7 +959,7 @@ with tabs[3]:
         st.subheader("Active Attribution Rules")
 
         if st.session_state.rules:
-            for rule in st.session_state.rules:
+            for rule in st.session_state.rules.values():
                 with st.expander(f"{'✅' if rule.active else '❌'} {rule.name}", expanded=False):
                     col1, col2 = st.columns(2)
                     with col1:
@@ -1009,7 +1009,7 @@ with tabs[3]:
                     conditions['partner_role'] = partner_role
 
                 new_rule = AttributionRule(
-                    id=len(st.session_state.rules) + 1,
+                    id=max(st.session_state.rules, default=0) + 1,
                     name=rule_name,
                     description=rule_desc,
                     model=AttributionModel(selected_model),
@@ -1039,7 +1039,7 @@ with tabs[3]:
                     template_data = get_template(template['name'])
                     if template_data:
                         new_rule = AttributionRule(
-                            id=len(st.session_state.rules) + 1,
+                            id=max(st.session_state.rules, default=0) + 1,
                             name=template_data.get('name', template['name']),
                             description=template_data.get('description', ''),
                             model=AttributionModel(template_data.get('model', 'equal_split')),
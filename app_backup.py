@@ -17,9 +17,17 @@ Key Features:
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
+import plotly.graph_objects as go
+import plotly.express as px
+import csv
+import io
 import json
+import zlib
 import calendar
+from collections import defaultdict
+from operator import attrgetter
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Any, Optional
 import warnings
@@ -32,6 +40,7 @@ warnings.filterwarnings('ignore', message='.*label.*got an empty value.*')
 from models_new import (
     AttributionTarget, PartnerTouchpoint, AttributionRule, LedgerEntry,
     TargetType, TouchpointType, AttributionModel, SplitConstraint,
+    MeasurementWorkflow, DataSourceConfig, DataSource,
     DEFAULT_PARTNER_ROLES, SCHEMA_VERSION,
     # NEW: Universal attribution types
     ActorType, RevenueType, Touchpoint
@@ -298,16 +307,212 @@ if "visible_metrics" not in st.session_state:
 # Helper Functions
 # ============================================================================
 
+# Visual rule-builder templates, computed once at import time so applying a
+# template is a cheap dict copy instead of rebuilding literals every rerun.
+_EQUAL_TEMPLATE_ROLES = DEFAULT_PARTNER_ROLES[:3]
+_EQUAL_TEMPLATE_SPLITS = {
+    role: 100 // len(_EQUAL_TEMPLATE_ROLES) for role in _EQUAL_TEMPLATE_ROLES
+}
+_SPLITS_603010 = {"Implementation (SI)": 60, "Influence": 30, "Referral": 10}
+_WINNER_SPLITS = {"First Touch": 100}
+
+# Default state for the visual rule builder; copied on init and reset.
+_VISUAL_BUILDER_DEFAULT = {
+    "rule_name": "My Custom Rule",
+    "roles": ["Implementation (SI)", "Referral"],
+    "splits": {"Implementation (SI)": 70, "Referral": 30},
+    "applies_to_all": True,
+    "min_deal_size": 0
+}
+
+
+def default_visual_builder_state() -> Dict[str, Any]:
+    """Fresh copy of the visual rule-builder defaults (mutable per session)."""
+    return {
+        **_VISUAL_BUILDER_DEFAULT,
+        "roles": list(_VISUAL_BUILDER_DEFAULT["roles"]),
+        "splits": dict(_VISUAL_BUILDER_DEFAULT["splits"]),
+    }
+
+
+@st.cache_resource
+def get_data_source_ingestion() -> "DataSourceIngestion":
+    """Singleton DataSourceIngestion shared across reruns and clicks."""
+    from data_ingestion import DataSourceIngestion
+    return DataSourceIngestion()
+
+
+def _collection_token(items: list) -> tuple:
+    """Cheap cache-invalidation token: length plus the last element's id."""
+    return (len(items), items[-1].id if items else 0)
+
+
+@st.cache_resource(max_entries=8)
+def index_by_target(_items: list, kind: str, token: tuple) -> Dict[int, list]:
+    """
+    Index a session collection (touchpoints, ledger) by target_id so the
+    per-deal views do one O(1) lookup instead of scanning every element on
+    each rerun. `_items` is deliberately unhashed; `kind` plus the token
+    from _collection_token() controls invalidation.
+    """
+    index = defaultdict(list)
+    for item in _items:
+        index[item.target_id].append(item)
+    return index
+
+
+@st.cache_data(max_entries=4)
+def build_deal_options(targets_fp: tuple) -> Dict[str, int]:
+    """Selectbox label -> target id map for the deal drilldown, cached so
+    the N label f-strings aren't re-formatted on every rerun."""
+    return {
+        f"{external_id} - {account_name} (${value:,.0f})": target_id
+        for target_id, external_id, account_name, value in targets_fp
+    }
+
+
+@st.cache_data(max_entries=4)
+def get_target_mapping(targets_fp: tuple) -> Dict[str, int]:
+    """Map target external_id -> internal id, cached on a targets fingerprint."""
+    return dict(targets_fp)
+
+
+def _attribution_inputs_fingerprint() -> tuple:
+    """Cheap, hashable fingerprint of everything that drives attribution."""
+    rules_key = tuple(
+        (r.id, r.priority, r.active, json.dumps(r.config, sort_keys=True, default=str))
+        for r in st.session_state.rules.values()
+    )
+    targets_key = tuple((t.id, t.value) for t in st.session_state.targets)
+    touchpoints_key = tuple(
+        (tp.id, tp.target_id, tp.partner_id, tp.role, tp.weight)
+        for tp in st.session_state.touchpoints
+    )
+    return (rules_key, targets_key, touchpoints_key)
+
+
+# Workflow templates as plain dict payloads. Keeping the specs as nested
+# dicts of primitives is cheap to define and copy; the MeasurementWorkflow /
+# DataSourceConfig dataclasses are only materialized when a template is
+# actually applied.
+_WORKFLOW_TEMPLATES = {
+    "Deal Registration Primary": {
+        "name": "Deal Registration Primary",
+        "description": "Use deal reg if exists, else touchpoint tracking",
+        "data_sources": [
+            {
+                "source_type": DataSource.DEAL_REGISTRATION,
+                "enabled": True,
+                "priority": 1,
+                "requires_validation": True,
+                "config": {"require_approval": True, "expiry_days": 90}
+            },
+            {
+                "source_type": DataSource.TOUCHPOINT_TRACKING,
+                "enabled": True,
+                "priority": 2,
+                "config": {}
+            }
+        ],
+        "conflict_resolution": "priority",
+        "fallback_strategy": "next_priority"
+    },
+    "Marketplace Only": {
+        "name": "Marketplace Only",
+        "description": "100% attribution to marketplace partner",
+        "data_sources": [
+            {
+                "source_type": DataSource.MARKETPLACE_TRANSACTIONS,
+                "enabled": True,
+                "priority": 1,
+                "config": {"platform": "aws"}
+            }
+        ],
+        "conflict_resolution": "priority",
+        "fallback_strategy": "manual",
+        "applies_to": {"metadata.source": "marketplace"}
+    },
+    "CRM Field with Fallback": {
+        "name": "CRM Partner Field with Fallback",
+        "description": "Use Partner__c if set, else calculate from touchpoints",
+        "data_sources": [
+            {
+                "source_type": DataSource.CRM_OPPORTUNITY_FIELD,
+                "enabled": True,
+                "priority": 1,
+                "config": {"field_name": "Partner__c", "role_field": "Partner_Role__c"}
+            },
+            {
+                "source_type": DataSource.TOUCHPOINT_TRACKING,
+                "enabled": True,
+                "priority": 2,
+                "config": {}
+            }
+        ],
+        "conflict_resolution": "priority",
+        "fallback_strategy": "next_priority"
+    },
+    "Hybrid SI + Influence (80/20)": {
+        "name": "Hybrid Deal Reg + Influence",
+        "description": "80% to deal reg partner, 20% to influence touchpoints",
+        "data_sources": [
+            {
+                "source_type": DataSource.DEAL_REGISTRATION,
+                "enabled": True,
+                "priority": 1,
+                "config": {"attribution_weight": 0.8, "require_approval": True}
+            },
+            {
+                "source_type": DataSource.TOUCHPOINT_TRACKING,
+                "enabled": True,
+                "priority": 2,
+                "config": {"attribution_weight": 0.2}
+            }
+        ],
+        "conflict_resolution": "merge",  # Combine both sources
+        "fallback_strategy": "next_priority"
+    },
+    "Touchpoint Tracking Only (Default)": {
+        "name": "Touchpoint Tracking (Default)",
+        "description": "Traditional activity-based tracking",
+        "data_sources": [
+            {
+                "source_type": DataSource.TOUCHPOINT_TRACKING,
+                "enabled": True,
+                "priority": 1,
+                "config": {}
+            }
+        ],
+        "conflict_resolution": "priority",
+        "fallback_strategy": "equal_split"
+    }
+}
+
+
 def calculate_attribution_for_all_targets():
     """
     Run attribution calculations for all targets using all active rules.
     Populates the ledger and persists to database.
+
+    Memoized on a fingerprint of rules, targets, and touchpoints: when the
+    inputs are unchanged since the last run (e.g. the user just toggled
+    tabs), the existing ledger is kept instead of being recomputed.
     """
+    fingerprint = _attribution_inputs_fingerprint()
+    if (st.session_state.get("_attribution_fingerprint") == fingerprint
+            and st.session_state.ledger):
+        return len(st.session_state.ledger)
+
     engine = AttributionEngine()
     session_mgr = st.session_state.session_manager
 
     # Use session manager's recalculation which persists to database
     entries_created = session_mgr.recalculate_attribution(engine)
+    st.session_state._attribution_fingerprint = fingerprint
+    # Keep the monotonic id counter ahead of everything the recompute created
+    st.session_state.next_ledger_id = max(
+        (e.id for e in st.session_state.ledger), default=0
+    ) + 1
 
     return entries_created
 
@@ -317,6 +522,10 @@ def get_ledger_as_dataframe() -> pd.DataFrame:
     Convert ledger to DataFrame for dashboard queries.
 
     Mimics the structure of the original attribution_events table.
+
+    Built columnar (one from_records pass plus vectorized target/partner
+    joins) and kept in session state until the ledger or targets change,
+    so dashboard reads share a single materialization.
     """
     if not st.session_state.ledger:
         return pd.DataFrame(columns=[
@@ -324,26 +533,45 @@ def get_ledger_as_dataframe() -> pd.DataFrame:
             "split_percent", "revenue_date", "account_id"
         ])
 
-    rows = []
-    for entry in st.session_state.ledger:
-        # Find the target to get revenue_date and metadata
-        target = next((t for t in st.session_state.targets if t.id == entry.target_id), None)
-        if not target:
-            continue
+    token = (
+        _collection_token(st.session_state.ledger),
+        _collection_token(st.session_state.targets),
+        len(st.session_state.partners),
+    )
+    if st.session_state.get("_ledger_df_token") == token:
+        return st.session_state._ledger_df
 
-        partner_name = st.session_state.partners.get(entry.partner_id, entry.partner_id)
+    targets_by_id = {t.id: t for t in st.session_state.targets}
+    df = pd.DataFrame.from_records(
+        [
+            (entry.partner_id, entry.attributed_value,
+             entry.split_percentage, entry.target_id)
+            for entry in st.session_state.ledger
+        ],
+        columns=["partner_id", "attributed_amount", "split_percent", "target_id"]
+    )
+    # Drop entries whose target is gone (mirrors the old per-row skip)
+    df = df[df["target_id"].isin(targets_by_id)]
 
-        rows.append({
-            "partner_id": entry.partner_id,
-            "partner_name": partner_name,
-            "attributed_amount": entry.attributed_value,
-            "split_percent": entry.split_percentage,
-            "revenue_date": target.timestamp.date() if isinstance(target.timestamp, datetime) else target.timestamp,
-            "account_id": target.metadata.get("account_id", "unknown"),
-            "accounts_influenced": 1  # Placeholder - would aggregate in real implementation
-        })
+    revenue_dates = {
+        tid: (t.timestamp.date() if isinstance(t.timestamp, datetime) else t.timestamp)
+        for tid, t in targets_by_id.items()
+    }
+    account_ids = {
+        tid: t.metadata.get("account_id", "unknown")
+        for tid, t in targets_by_id.items()
+    }
+    df["partner_name"] = (
+        df["partner_id"].map(st.session_state.partners).fillna(df["partner_id"])
+    )
+    df["revenue_date"] = df["target_id"].map(revenue_dates)
+    df["account_id"] = df["target_id"].map(account_ids)
+    df["accounts_influenced"] = 1  # Placeholder - would aggregate in real implementation
+    df = df.drop(columns=["target_id"])
 
-    return pd.DataFrame(rows)
+    st.session_state._ledger_df_token = token
+    st.session_state._ledger_df = df
+    return df
 
 
 def get_revenue_as_dataframe() -> pd.DataFrame:
@@ -368,7 +596,21 @@ def apply_global_filters(ledger_entries: List[LedgerEntry]) -> List[LedgerEntry]
     """
     Apply global filters to ledger entries.
     Returns filtered list based on sidebar filter selections.
+
+    Memoized per rerun: every tab calls this with the session ledger, so
+    the result is computed once and shared until the filters or the
+    ledger change.
     """
+    gf = st.session_state.global_filters
+    fingerprint = (
+        tuple(gf["date_range"]) if gf["date_range"] else None,
+        tuple(sorted(gf["selected_partners"])) if gf["selected_partners"] else None,
+        gf["min_deal_size"],
+        _collection_token(ledger_entries),
+    )
+    if st.session_state.get("_filter_fingerprint") == fingerprint:
+        return st.session_state._filtered_ledger
+
     filtered = ledger_entries
 
     # Date range filter
@@ -397,9 +639,123 @@ def apply_global_filters(ledger_entries: List[LedgerEntry]) -> List[LedgerEntry]
             if entry.attributed_value >= st.session_state.global_filters["min_deal_size"]
         ]
 
+    st.session_state._filter_fingerprint = fingerprint
+    st.session_state._filtered_ledger = filtered
     return filtered
 
 
+@st.cache_data(max_entries=8)
+def render_ledger_csv(ledger_token: int, _entries: List[LedgerEntry]) -> str:
+    """Serialize ledger entries to CSV, cached on an id/value token.
+
+    The entries themselves are passed unhashed (underscore prefix); the
+    token captures everything that affects the output.
+    """
+    return export_ledger_to_csv(_entries)
+
+
+@st.cache_data(max_entries=16)
+def render_deal_csv(target_id: int, ledger_token: int, _df: pd.DataFrame) -> bytes:
+    """Encode one deal's attribution table as CSV bytes, cached per ledger state."""
+    return _df.to_csv(index=False).encode('utf-8')
+
+
+def _ledger_token(entries: List[LedgerEntry]) -> int:
+    """adler32 digest of ledger rows for the CSV caches.
+
+    A single int key means Streamlit's cache hasher does O(1) work
+    instead of pickling and md5-hashing a tuple per row.
+    """
+    buf = ",".join(
+        f"{e.id}:{e.split_percentage}:{e.attributed_value}" for e in entries
+    ).encode()
+    return zlib.adler32(buf)
+
+
+@st.cache_data(max_entries=16)
+def build_pie_figure(target_label: str, items_tuple: tuple) -> "go.Figure":
+    """Build (and cache) the attribution split pie for one deal.
+
+    Keyed on the deal label plus a (partner, value) tuple so the figure is
+    only regenerated when the underlying ledger rows change.
+    """
+    chart_df = pd.DataFrame(items_tuple, columns=["Partner", "Value"])
+    # Cap cardinality: keep the top 8 slices, fold the tail into "Other"
+    if len(chart_df) > 8:
+        chart_df = chart_df.sort_values("Value", ascending=False)
+        other_sum = chart_df["Value"].iloc[8:].sum()
+        chart_df = chart_df.iloc[:8]
+        if other_sum > 0:
+            chart_df = pd.concat(
+                [chart_df, pd.DataFrame([{"Partner": "Other", "Value": other_sum}])],
+                ignore_index=True,
+            )
+    fig = px.pie(
+        chart_df,
+        values='Value',
+        names='Partner',
+        title=f"Attribution Split - {target_label}",
+        hole=0.4
+    )
+    fig.update_traces(sort=False)
+    return fig
+
+
+@st.cache_data(max_entries=32)
+def build_split_figure(splits_items: tuple) -> "go.Figure":
+    """
+    Build the credit-split bar chart for the visual rule builder.
+
+    Memoized on the (role, percent) tuple so unrelated widget interactions
+    inside the tab don't pay for Plotly figure construction and JSON
+    serialization on every rerun.
+    """
+    splits = dict(splits_items)
+    fig = go.Figure(data=[
+        go.Bar(
+            x=list(splits.values()),
+            y=list(splits.keys()),
+            orientation='h',
+            text=[f"{v}%" for v in splits.values()],
+            textposition='inside',
+            marker=dict(
+                color=['#3b82f6', '#8b5cf6', '#ec4899', '#f59e0b'][:len(splits)]
+            )
+        )
+    ])
+
+    fig.update_layout(
+        title="Credit Split Visualization",
+        xaxis_title="Percentage (%)",
+        yaxis_title="Partner Role",
+        height=300,
+        showlegend=False,
+        uirevision='splits'  # Reuse the DOM subtree across updates
+    )
+
+    return fig
+
+
+def stream_ledger_csv(ledger_entries: List[LedgerEntry]):
+    """
+    Yield the full ledger as encoded CSV chunks via csv.DictWriter and a
+    rolling buffer, instead of materializing a list of dicts, a DataFrame,
+    and an encoded bytestring all at once.
+    """
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=list(ledger_entries[0].to_dict().keys()))
+    writer.writeheader()
+
+    for entry in ledger_entries:
+        writer.writerow(entry.to_dict())
+        if buf.tell() > 64 * 1024:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate(0)
+
+    yield buf.getvalue().encode("utf-8")
+
+
 def export_ledger_to_csv(ledger_entries: List[LedgerEntry]) -> str:
     """Convert ledger entries to CSV format for download."""
     if not ledger_entries:
@@ -516,7 +872,7 @@ with st.sidebar:
     st.metric("Targets Loaded", len(st.session_state.targets))
     st.metric("Ledger Entries", f"{len(filtered_ledger)} / {len(st.session_state.ledger)}")
     st.metric("Filtered Revenue", f"${filtered_revenue:,.0f}")
-    st.metric("Active Rules", len([r for r in st.session_state.rules if r.active]))
+    st.metric("Active Rules", len([r for r in st.session_state.rules.values() if r.active]))
 
     st.markdown("---")
     st.markdown("### 🏗️ Architecture")
@@ -1738,7 +2094,7 @@ Perfect for exploring features and presenting to stakeholders.
                 # Clear existing data
                 st.session_state.targets = demo_targets
                 st.session_state.touchpoints = demo_touchpoints
-                st.session_state.rules = demo_rules
+                st.session_state.rules = {r.id: r for r in demo_rules}
                 st.session_state.ledger = demo_ledger
 
                 # Update partners dictionary
@@ -2297,36 +2653,23 @@ with tabs[8]:
 
     # Initialize session state for rule builder
     if "visual_builder" not in st.session_state:
-        st.session_state.visual_builder = {
-            "rule_name": "My Custom Rule",
-            "roles": ["Implementation (SI)", "Referral"],
-            "splits": {"Implementation (SI)": 70, "Referral": 30},
-            "applies_to_all": True,
-            "min_deal_size": 0
-        }
+        st.session_state.visual_builder = default_visual_builder_state()
 
     # Apply template if selected
     if template_selected == "equal":
         st.session_state.visual_builder["rule_name"] = "Equal Split"
-        st.session_state.visual_builder["splits"] = {
-            role: 100 // len(DEFAULT_PARTNER_ROLES)
-            for role in DEFAULT_PARTNER_ROLES[:3]
-        }
-        st.session_state.visual_builder["roles"] = DEFAULT_PARTNER_ROLES[:3]
+        st.session_state.visual_builder["splits"] = dict(_EQUAL_TEMPLATE_SPLITS)
+        st.session_state.visual_builder["roles"] = list(_EQUAL_TEMPLATE_ROLES)
 
     elif template_selected == "603010":
         st.session_state.visual_builder["rule_name"] = "60/30/10 Split"
-        st.session_state.visual_builder["splits"] = {
-            "Implementation (SI)": 60,
-            "Influence": 30,
-            "Referral": 10
-        }
-        st.session_state.visual_builder["roles"] = ["Implementation (SI)", "Influence", "Referral"]
+        st.session_state.visual_builder["splits"] = dict(_SPLITS_603010)
+        st.session_state.visual_builder["roles"] = list(_SPLITS_603010)
 
     elif template_selected == "winner":
         st.session_state.visual_builder["rule_name"] = "Winner Takes All"
-        st.session_state.visual_builder["splits"] = {"First Touch": 100}
-        st.session_state.visual_builder["roles"] = ["First Touch"]
+        st.session_state.visual_builder["splits"] = dict(_WINNER_SPLITS)
+        st.session_state.visual_builder["roles"] = list(_WINNER_SPLITS)
 
     # Step 1: Which deals does this apply to?
     st.markdown("### 1️⃣ Which deals should use this rule?")
@@ -2363,13 +2706,12 @@ with tabs[8]:
                 key="product_filter"
             )
 
-    st.markdown("---")
-
-    # Step 2: Build the split
-    st.markdown("### 2️⃣ How should we split credit among partners?")
-
-    # Role selection
-    st.markdown("**Select partner roles:**")
+    # Step 2: Build the split (one delta message instead of three)
+    st.markdown(
+        "---\n\n"
+        "### 2️⃣ How should we split credit among partners?\n\n"
+        "**Select partner roles:**"
+    )
     selected_roles = st.multiselect(
         "",
         options=DEFAULT_PARTNER_ROLES,
@@ -2388,11 +2730,17 @@ with tabs[8]:
 
     # Visual sliders for each role
     splits = {}
-    total_allocated = 0
+
+    # Widget keys and help strings built once, not per-slider per-rerun
+    slider_meta = {
+        role: (f"split_{role}", f"Percentage of deal value attributed to {role}")
+        for role in selected_roles
+    }
 
     for role in selected_roles:
         # Get previous value or default
         default_value = st.session_state.visual_builder["splits"].get(role, 100 // len(selected_roles))
+        slider_key, slider_help = slider_meta[role]
 
         col1, col2 = st.columns([3, 1])
 
@@ -2403,77 +2751,68 @@ with tabs[8]:
                 max_value=100,
                 value=int(default_value),
                 step=5,
-                key=f"split_{role}",
-                help=f"Percentage of deal value attributed to {role}"
+                key=slider_key,
+                help=slider_help
             )
 
         with col2:
             st.metric("Percentage", f"{split_pct}%", label_visibility="collapsed")
 
         splits[role] = split_pct
-        total_allocated += split_pct
 
     st.session_state.visual_builder["splits"] = splits
 
-    # Validation
+    # Validation: one C-level sum after the loop; stop the invalid state
+    # here so the preview and save sections below never execute for it.
+    total_allocated = sum(splits.values())
+
     st.markdown("---")
 
     if total_allocated != 100:
         st.error(f"❌ **Total is {total_allocated}%** (must equal 100%)")
         st.markdown("Adjust the sliders above so they add up to 100%")
-    else:
-        st.success(f"✅ **Perfect!** Splits add up to 100%")
+        st.stop()
+
+    st.success(f"✅ **Perfect!** Splits add up to 100%")
 
     # Step 3: Live Preview
-    st.markdown("---")
-    st.markdown("### 3️⃣ Preview")
+    st.markdown("---\n\n### 3️⃣ Preview")
 
+    # Only reached with a valid 100% split (st.stop() above otherwise), so
+    # the preview is never built just to be thrown away mid-drag.
     # Example deal preview
     st.markdown("**Example: $100,000 Deal**")
 
-    preview_data = []
-    for role, pct in splits.items():
-        amount = 100000 * (pct / 100)
-        preview_data.append({
-            "Partner Role": role,
-            "Split": f"{pct}%",
-            "Amount": f"${amount:,.0f}"
-        })
-
-    # Show as a nice table
-    import pandas as pd
-    preview_df = pd.DataFrame(preview_data)
-    st.dataframe(preview_df, width='stretch', hide_index=True)
-
-    # Visual bar chart
-    import plotly.graph_objects as go
+    # A 4-row static preview doesn't need the Arrow-backed st.dataframe
+    # grid; a plain markdown table renders with no serialization overhead.
+    # Amounts are computed as a NumPy broadcast so this scales to a
+    # multi-deal preview (deal_values x pcts) without a rewrite.
+    pcts = np.fromiter(splits.values(), dtype=np.int64, count=len(splits))
+    amounts = (100000 * pcts) // 100
+    preview_rows = "\n".join(
+        f"| {role} | {pct}% | ${amount:,} |"
+        for role, pct, amount in zip(splits.keys(), pcts.tolist(), amounts.tolist())
+    )
+    st.markdown(
+        "| Partner Role | Split | Amount |\n"
+        "| --- | --- | --- |\n"
+        + preview_rows
+    )
 
-    fig = go.Figure(data=[
-        go.Bar(
-            x=list(splits.values()),
-            y=list(splits.keys()),
-            orientation='h',
-            text=[f"{v}%" for v in splits.values()],
-            textposition='inside',
-            marker=dict(
-                color=['#3b82f6', '#8b5cf6', '#ec4899', '#f59e0b'][:len(splits)]
-            )
-        )
-    ])
+    # Visual bar chart (memoized on the current splits). The preview is
+    # decorative, so render it as a static plot with no mode bar and skip
+    # Streamlit's theme merge.
+    fig = build_split_figure(tuple(sorted(splits.items())))
 
-    fig.update_layout(
-        title="Credit Split Visualization",
-        xaxis_title="Percentage (%)",
-        yaxis_title="Partner Role",
-        height=300,
-        showlegend=False
+    st.plotly_chart(
+        fig,
+        width='stretch',
+        theme=None,
+        config={'staticPlot': True, 'displayModeBar': False, 'responsive': True}
     )
 
-    st.plotly_chart(fig, width='stretch')
-
     # Step 4: Save
-    st.markdown("---")
-    st.markdown("### 4️⃣ Save Your Rule")
+    st.markdown("---\n\n### 4️⃣ Save Your Rule")
 
     col1, col2 = st.columns([2, 1])
 
@@ -2489,11 +2828,11 @@ with tabs[8]:
         st.markdown("")  # Spacing
         st.markdown("")
 
-        if total_allocated == 100 and rule_name:
+        if rule_name:
             if st.button("💾 Save Rule", type="primary", width='stretch', key="save_visual_rule"):
                 # Create the rule
                 new_rule = AttributionRule(
-                    id=len(st.session_state.rules) + 1,
+                    id=max(st.session_state.rules, default=0) + 1,
                     name=rule_name,
                     model_type=AttributionModel.ROLE_WEIGHTED,
                     config={"weights": {role: pct/100 for role, pct in splits.items()}},
@@ -2505,7 +2844,7 @@ with tabs[8]:
                     active=True
                 )
 
-                st.session_state.rules.append(new_rule)
+                st.session_state.rules[new_rule.id] = new_rule
 
                 # Recalculate attribution
                 with st.spinner("💡 Applying your new rule..."):
@@ -2515,21 +2854,12 @@ with tabs[8]:
                 st.balloons()
 
                 # Reset builder
-                st.session_state.visual_builder = {
-                    "rule_name": "My Custom Rule",
-                    "roles": ["Implementation (SI)", "Referral"],
-                    "splits": {"Implementation (SI)": 70, "Referral": 30},
-                    "applies_to_all": True,
-                    "min_deal_size": 0
-                }
+                st.session_state.visual_builder = default_visual_builder_state()
 
                 st.rerun()
         else:
             st.button("💾 Save Rule", type="primary", width='stretch', disabled=True, key="save_visual_rule_disabled")
-            if total_allocated != 100:
-                st.caption("⚠️ Fix the split percentages first")
-            elif not rule_name:
-                st.caption("⚠️ Enter a rule name first")
+            st.caption("⚠️ Enter a rule name first")
 
     # Advanced: Natural Language Option
     with st.expander("💬 Or describe your rule in plain English (Advanced)", expanded=False):
@@ -2556,7 +2886,7 @@ with tabs[9]:
     if st.session_state.rules:
         st.markdown(f"### Active Rules ({len(st.session_state.rules)})")
 
-        for rule in st.session_state.rules:
+        for rule in list(st.session_state.rules.values()):
             with st.expander(f"{'✅' if rule.active else '❌'} {rule.name} ({rule.model_type.value})"):
                 st.markdown(f"**Priority:** {rule.priority}")
                 st.markdown(f"**Split Constraint:** {rule.split_constraint.value}")
@@ -2570,7 +2900,7 @@ with tabs[9]:
 
                 with col2:
                     if st.button("Delete", key=f"delete_{rule.id}"):
-                        st.session_state.rules = [r for r in st.session_state.rules if r.id != rule.id]
+                        del st.session_state.rules[rule.id]
                         st.rerun()
     else:
         st.info("No rules created yet. Use the Rule Builder tab to create your first rule!")
@@ -2597,49 +2927,68 @@ with tabs[10]:
 
     # Initialize workflows in session state
     if "workflows" not in st.session_state:
-        st.session_state.workflows = []
+        st.session_state.workflows = {}
+
+    # Single source of truth for the primary workflow; is_primary is derived
+    # at render time instead of flipping booleans across every workflow.
+    if "primary_workflow_id" not in st.session_state:
+        st.session_state.primary_workflow_id = next(
+            (w.id for w in st.session_state.workflows.values() if w.is_primary), None
+        )
 
     # Show existing workflows
     if st.session_state.workflows:
         st.markdown("### 📋 Your Workflows")
 
-        for workflow in st.session_state.workflows:
-            with st.expander(f"{'⭐ PRIMARY' if workflow.is_primary else '🔧'} {workflow.name}", expanded=False):
-                st.markdown(f"**Description:** {workflow.description}")
-
-                # Data sources
-                st.markdown("**Data Sources (Priority Order):**")
-                sorted_sources = sorted(workflow.data_sources, key=lambda x: x.priority)
-                for i, ds in enumerate(sorted_sources):
-                    status = "✅ Enabled" if ds.enabled else "❌ Disabled"
-                    st.markdown(f"{i+1}. **{ds.source_type.value}** - Priority {ds.priority} - {status}")
-                    if ds.config:
-                        st.json(ds.config)
-
-                # Conflict resolution
-                st.markdown(f"**Conflict Resolution:** {workflow.conflict_resolution}")
-                st.markdown(f"**Fallback Strategy:** {workflow.fallback_strategy}")
-
-                # Actions
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    if not workflow.is_primary and st.button(f"Set as Primary", key=f"primary_{workflow.id}"):
-                        # Mark this as primary, unmark others
-                        for w in st.session_state.workflows:
-                            w.is_primary = (w.id == workflow.id)
-                        st.success(f"✅ Set {workflow.name} as primary workflow")
-                        st.rerun()
+        # Render details for one workflow at a time: expanders execute their
+        # bodies even when collapsed, so a per-workflow loop costs O(N) per
+        # rerun while this selector keeps it O(1).
+        workflow_labels = {
+            f"{'⭐ PRIMARY' if w.id == st.session_state.primary_workflow_id else '🔧'} {w.name} (#{w.id})": w.id
+            for w in st.session_state.workflows.values()
+        }
+        picked_label = st.selectbox(
+            "Inspect workflow",
+            options=list(workflow_labels.keys()),
+            key="wf_pick"
+        )
+        workflow = st.session_state.workflows[workflow_labels[picked_label]]
+        is_primary = (workflow.id == st.session_state.primary_workflow_id)
 
-                with col2:
-                    if st.button(f"{'Disable' if workflow.active else 'Enable'}", key=f"toggle_{workflow.id}"):
-                        workflow.active = not workflow.active
-                        st.rerun()
+        st.markdown(f"**Description:** {workflow.description}")
 
-                with col3:
-                    if st.button(f"Delete", key=f"del_workflow_{workflow.id}", type="secondary"):
-                        st.session_state.workflows.remove(workflow)
-                        st.success(f"🗑️ Deleted {workflow.name}")
-                        st.rerun()
+        # Data sources (kept sorted by priority at creation time)
+        st.markdown("**Data Sources (Priority Order):**")
+        for i, ds in enumerate(workflow.data_sources):
+            status = "✅ Enabled" if ds.enabled else "❌ Disabled"
+            st.markdown(f"{i+1}. **{ds.source_type.value}** - Priority {ds.priority} - {status}")
+            if ds.config:
+                st.json(ds.config)
+
+        # Conflict resolution
+        st.markdown(f"**Conflict Resolution:** {workflow.conflict_resolution}")
+        st.markdown(f"**Fallback Strategy:** {workflow.fallback_strategy}")
+
+        # Actions
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if not is_primary and st.button(f"Set as Primary", key=f"primary_{workflow.id}"):
+                st.session_state.primary_workflow_id = workflow.id
+                st.success(f"✅ Set {workflow.name} as primary workflow")
+                st.rerun()
+
+        with col2:
+            if st.button(f"{'Disable' if workflow.active else 'Enable'}", key=f"toggle_{workflow.id}"):
+                workflow.active = not workflow.active
+                st.rerun()
+
+        with col3:
+            if st.button(f"Delete", key=f"del_workflow_{workflow.id}", type="secondary"):
+                del st.session_state.workflows[workflow.id]
+                if st.session_state.primary_workflow_id == workflow.id:
+                    st.session_state.primary_workflow_id = None
+                st.success(f"🗑️ Deleted {workflow.name}")
+                st.rerun()
 
     else:
         st.info("No workflows configured yet. Create one from a template below.")
@@ -2671,145 +3020,41 @@ with tabs[10]:
     st.info(f"ℹ️ {template_descriptions[template_option]}")
 
     if st.button("Create Workflow from Template", type="primary"):
-        from models_new import MeasurementWorkflow, DataSourceConfig, DataSource
-        from datetime import datetime
-
         # Generate workflow ID
-        workflow_id = len(st.session_state.workflows) + 1
-
-        # Create workflow based on template
-        if template_option == "Deal Registration Primary":
-            workflow = MeasurementWorkflow(
-                id=workflow_id,
-                company_id="demo_company",
-                name="Deal Registration Primary",
-                description="Use deal reg if exists, else touchpoint tracking",
-                data_sources=[
-                    DataSourceConfig(
-                        source_type=DataSource.DEAL_REGISTRATION,
-                        enabled=True,
-                        priority=1,
-                        requires_validation=True,
-                        config={"require_approval": True, "expiry_days": 90}
-                    ),
-                    DataSourceConfig(
-                        source_type=DataSource.TOUCHPOINT_TRACKING,
-                        enabled=True,
-                        priority=2,
-                        config={}
-                    )
-                ],
-                conflict_resolution="priority",
-                fallback_strategy="next_priority",
-                is_primary=len(st.session_state.workflows) == 0,  # First workflow is primary
-                active=True,
-                created_at=datetime.now()
-            )
-
-        elif template_option == "Marketplace Only":
-            workflow = MeasurementWorkflow(
-                id=workflow_id,
-                company_id="demo_company",
-                name="Marketplace Only",
-                description="100% attribution to marketplace partner",
-                data_sources=[
-                    DataSourceConfig(
-                        source_type=DataSource.MARKETPLACE_TRANSACTIONS,
-                        enabled=True,
-                        priority=1,
-                        config={"platform": "aws"}
-                    )
-                ],
-                conflict_resolution="priority",
-                fallback_strategy="manual",
-                applies_to={"metadata.source": "marketplace"},
-                is_primary=False,
-                active=True,
-                created_at=datetime.now()
-            )
+        workflow_id = max(st.session_state.workflows, default=0) + 1
+
+        # Materialize the dataclasses from the plain-dict template spec
+        spec = _WORKFLOW_TEMPLATES[template_option]
+        workflow = MeasurementWorkflow(
+            id=workflow_id,
+            company_id="demo_company",
+            name=spec["name"],
+            description=spec["description"],
+            data_sources=[
+                DataSourceConfig(**ds) for ds in spec["data_sources"]
+            ],
+            conflict_resolution=spec["conflict_resolution"],
+            fallback_strategy=spec["fallback_strategy"],
+            applies_to=dict(spec.get("applies_to", {})),
+            is_primary=False,
+            active=True,
+            created_at=datetime.now()
+        )
 
-        elif template_option == "CRM Field with Fallback":
-            workflow = MeasurementWorkflow(
-                id=workflow_id,
-                company_id="demo_company",
-                name="CRM Partner Field with Fallback",
-                description="Use Partner__c if set, else calculate from touchpoints",
-                data_sources=[
-                    DataSourceConfig(
-                        source_type=DataSource.CRM_OPPORTUNITY_FIELD,
-                        enabled=True,
-                        priority=1,
-                        config={"field_name": "Partner__c", "role_field": "Partner_Role__c"}
-                    ),
-                    DataSourceConfig(
-                        source_type=DataSource.TOUCHPOINT_TRACKING,
-                        enabled=True,
-                        priority=2,
-                        config={}
-                    )
-                ],
-                conflict_resolution="priority",
-                fallback_strategy="next_priority",
-                is_primary=len(st.session_state.workflows) == 0,
-                active=True,
-                created_at=datetime.now()
-            )
+        # Sort once at creation so render loops can iterate in priority order
+        workflow.data_sources.sort(key=lambda ds: ds.priority)
 
-        elif template_option == "Hybrid SI + Influence (80/20)":
-            workflow = MeasurementWorkflow(
-                id=workflow_id,
-                company_id="demo_company",
-                name="Hybrid Deal Reg + Influence",
-                description="80% to deal reg partner, 20% to influence touchpoints",
-                data_sources=[
-                    DataSourceConfig(
-                        source_type=DataSource.DEAL_REGISTRATION,
-                        enabled=True,
-                        priority=1,
-                        config={"attribution_weight": 0.8, "require_approval": True}
-                    ),
-                    DataSourceConfig(
-                        source_type=DataSource.TOUCHPOINT_TRACKING,
-                        enabled=True,
-                        priority=2,
-                        config={"attribution_weight": 0.2}
-                    )
-                ],
-                conflict_resolution="merge",  # Combine both sources
-                fallback_strategy="next_priority",
-                is_primary=len(st.session_state.workflows) == 0,
-                active=True,
-                created_at=datetime.now()
-            )
+        st.session_state.workflows[workflow.id] = workflow
 
-        else:  # Touchpoint Tracking Only
-            workflow = MeasurementWorkflow(
-                id=workflow_id,
-                company_id="demo_company",
-                name="Touchpoint Tracking (Default)",
-                description="Traditional activity-based tracking",
-                data_sources=[
-                    DataSourceConfig(
-                        source_type=DataSource.TOUCHPOINT_TRACKING,
-                        enabled=True,
-                        priority=1,
-                        config={}
-                    )
-                ],
-                conflict_resolution="priority",
-                fallback_strategy="equal_split",
-                is_primary=len(st.session_state.workflows) == 0,
-                active=True,
-                created_at=datetime.now()
-            )
+        # First workflow becomes primary
+        if st.session_state.primary_workflow_id is None:
+            st.session_state.primary_workflow_id = workflow.id
 
-        st.session_state.workflows.append(workflow)
         st.success(f"✅ Created workflow: {workflow.name}")
         st.rerun()
 
     # Data Source Upload
-    st.markdown("---")
-    st.markdown("### 📥 Upload Data from Different Sources")
+    st.markdown("---\n\n### 📥 Upload Data from Different Sources")
 
     upload_source_type = st.selectbox(
         "Data Source Type",
@@ -2837,18 +3082,18 @@ with tabs[10]:
 
         if uploaded_file:
             if st.button("Process Deal Registrations"):
-                from data_ingestion import DataSourceIngestion
-
-                ingestion = DataSourceIngestion()
+                ingestion = get_data_source_ingestion()
 
                 # Get primary workflow for validation rules
-                primary_workflow = next((w for w in st.session_state.workflows if w.is_primary), None)
+                primary_workflow = st.session_state.workflows.get(st.session_state.primary_workflow_id)
 
-                # Create target mapping
-                target_mapping = {t.external_id: t.id for t in st.session_state.targets}
+                # Create target mapping (cached across repeat clicks)
+                target_mapping = get_target_mapping(
+                    tuple((t.external_id, t.id) for t in st.session_state.targets)
+                )
 
                 result = ingestion.ingest_deal_registrations(
-                    csv_content=uploaded_file.getvalue(),
+                    csv_content=uploaded_file,
                     workflow=primary_workflow,
                     target_id_mapping=target_mapping
                 )
@@ -2900,7 +3145,7 @@ with tabs[4]:
         st.markdown("") # Spacing
         if st.button("📥 Export CSV", key="deal_export", width='stretch'):
             filtered_ledger = apply_global_filters(st.session_state.ledger)
-            csv_data = export_ledger_to_csv(filtered_ledger)
+            csv_data = render_ledger_csv(_ledger_token(filtered_ledger), filtered_ledger)
             st.download_button(
                 "Download Data",
                 csv_data,
@@ -2917,11 +3162,10 @@ with tabs[4]:
         # Deal Selector
         st.markdown("### Select Deal to Analyze")
 
-        deal_options = {}
-        for target in st.session_state.targets:
-            account_name = target.metadata.get('account_name', 'Unknown Account')
-            deal_label = f"{target.external_id} - {account_name} (${target.value:,.0f})"
-            deal_options[deal_label] = target.id
+        deal_options = build_deal_options(tuple(
+            (t.id, t.external_id, t.metadata.get('account_name', 'Unknown Account'), t.value)
+            for t in st.session_state.targets
+        ))
 
         selected_deal_label = st.selectbox(
             "Choose Deal",
@@ -2932,6 +3176,10 @@ with tabs[4]:
         selected_target_id = deal_options[selected_deal_label]
         selected_target = next(t for t in st.session_state.targets if t.id == selected_target_id)
 
+        # Local binding: skip the session_state attribute machinery in the
+        # per-row loops below.
+        partner_display = st.session_state.partners
+
         # Deal Summary Card
         st.markdown("---")
         st.markdown("### Deal Information")
@@ -2957,21 +3205,39 @@ with tabs[4]:
         st.markdown("---")
         st.markdown("### Partner Engagement History")
 
-        deal_touchpoints = [tp for tp in st.session_state.touchpoints if tp.target_id == selected_target_id]
+        tp_index = index_by_target(
+            st.session_state.touchpoints, "touchpoints",
+            _collection_token(st.session_state.touchpoints)
+        )
+        deal_touchpoints = tp_index.get(selected_target_id, [])
 
         if deal_touchpoints:
-            touchpoint_data = []
-            for tp in sorted(deal_touchpoints, key=lambda x: x.timestamp or datetime.min):
-                partner_name = st.session_state.partners.get(tp.partner_id, tp.partner_id)
-                touchpoint_data.append({
-                    "Partner": partner_name,
-                    "Role": tp.role,
-                    "Date": tp.timestamp.strftime("%Y-%m-%d") if tp.timestamp else "N/A",
-                    "Activity Weight": f"{tp.weight:.0f}",
-                    "Days Before Close": (selected_target.timestamp - tp.timestamp).days if (selected_target.timestamp and tp.timestamp) else "N/A"
-                })
+            # Columnar construction: one from_records pass plus vectorized
+            # map/strftime instead of a dict per row.
+            # C-level attrgetter key; undated touchpoints sort first
+            undated_tps = [tp for tp in deal_touchpoints if not tp.timestamp]
+            sorted_tps = undated_tps + sorted(
+                (tp for tp in deal_touchpoints if tp.timestamp),
+                key=attrgetter('timestamp')
+            )
+            tp_df = pd.DataFrame.from_records(
+                [(tp.partner_id, tp.role, tp.timestamp, tp.weight) for tp in sorted_tps],
+                columns=["partner_id", "Role", "ts", "weight"]
+            )
+            tp_ts = pd.to_datetime(tp_df["ts"])
+            tp_df["Partner"] = tp_df["partner_id"].map(partner_display).fillna(tp_df["partner_id"])
+            tp_df["Date"] = tp_ts.dt.strftime("%Y-%m-%d").fillna("N/A")
+            tp_df["Activity Weight"] = tp_df["weight"].map("{:.0f}".format)
+            if selected_target.timestamp:
+                days_before = (pd.Timestamp(selected_target.timestamp) - tp_ts).dt.days
+                tp_df["Days Before Close"] = days_before.astype("object").where(tp_ts.notna(), "N/A")
+            else:
+                tp_df["Days Before Close"] = "N/A"
 
-            st.dataframe(pd.DataFrame(touchpoint_data), width='stretch', hide_index=True)
+            st.dataframe(
+                tp_df[["Partner", "Role", "Date", "Activity Weight", "Days Before Close"]],
+                width='stretch', hide_index=True
+            )
         else:
             st.warning("No partner touchpoints recorded for this deal.")
 
@@ -2979,7 +3245,11 @@ with tabs[4]:
         st.markdown("---")
         st.markdown("### Attribution Calculation Breakdown")
 
-        deal_ledger = [entry for entry in st.session_state.ledger if entry.target_id == selected_target_id]
+        ledger_index = index_by_target(
+            st.session_state.ledger, "ledger",
+            _collection_token(st.session_state.ledger)
+        )
+        deal_ledger = ledger_index.get(selected_target_id, [])
 
         if deal_ledger:
             # Summary metrics
@@ -3000,63 +3270,96 @@ with tabs[4]:
             # Detailed Attribution Table
             st.markdown("#### Partner-by-Partner Breakdown")
 
-            attribution_data = []
-            for entry in sorted(deal_ledger, key=lambda e: e.attributed_value, reverse=True):
-                partner_name = st.session_state.partners.get(entry.partner_id, entry.partner_id)
-                rule = next((r for r in st.session_state.rules if r.id == entry.rule_id), None)
-                rule_name = rule.name if rule else f"Rule #{entry.rule_id}"
-
-                # Get touchpoint details for this partner
-                partner_tps = [tp for tp in deal_touchpoints if tp.partner_id == entry.partner_id]
-                num_touchpoints = len(partner_tps)
-                roles = ", ".join(set(tp.role for tp in partner_tps)) if partner_tps else "N/A"
-
-                attribution_data.append({
-                    "Partner": partner_name,
-                    "Role(s)": roles,
-                    "Touchpoints": num_touchpoints,
-                    "Attribution %": f"{entry.split_percentage:.1%}",
-                    "Attributed $": f"${entry.attributed_value:,.2f}",
-                    "Rule Applied": rule_name,
-                    "Calculated": entry.calculation_timestamp.strftime("%Y-%m-%d %H:%M")
-                })
-
-            st.dataframe(pd.DataFrame(attribution_data), width='stretch', hide_index=True)
+            sorted_ledger = sorted(deal_ledger, key=attrgetter('attributed_value'), reverse=True)
+            # Bucket touchpoints by partner once: O(T + L) rather than O(T x L)
+            tp_buckets = defaultdict(list)
+            for tp in deal_touchpoints:
+                tp_buckets[tp.partner_id].append(tp)
+            partner_stats = {
+                pid: (len(tps), ", ".join({tp.role for tp in tps}))
+                for pid, tps in tp_buckets.items()
+            }
 
-            # Visualization
-            st.markdown("#### Attribution Split Visualization")
+            # Columnar construction with vectorized formatting passes
+            attribution_df = pd.DataFrame.from_records(
+                [
+                    (entry.partner_id, entry.rule_id, entry.split_percentage,
+                     entry.attributed_value, entry.calculation_timestamp)
+                    for entry in sorted_ledger
+                ],
+                columns=["partner_id", "rule_id", "split", "value", "calc_ts"]
+            )
+            attribution_df["Partner"] = (
+                attribution_df["partner_id"].map(partner_display).fillna(attribution_df["partner_id"])
+            )
+            entry_stats = [
+                partner_stats.get(entry.partner_id, (0, "N/A"))
+                for entry in sorted_ledger
+            ]
+            attribution_df["Role(s)"] = [roles or "N/A" for _, roles in entry_stats]
+            attribution_df["Touchpoints"] = [count for count, _ in entry_stats]
+            attribution_df["Rule Applied"] = [
+                st.session_state.rules[rid].name if rid in st.session_state.rules else f"Rule #{rid}"
+                for rid in attribution_df["rule_id"]
+            ]
+            attribution_df["Calculated"] = pd.to_datetime(attribution_df["calc_ts"])
 
-            attribution_chart_df = pd.DataFrame([
-                {"Partner": st.session_state.partners.get(entry.partner_id, entry.partner_id),
-                 "Value": entry.attributed_value}
-                for entry in deal_ledger
-            ])
+            # Numeric columns stay raw: formatting happens client-side via
+            # column_config, which keeps value-based sorting working
+            attribution_display = attribution_df.rename(columns={
+                "split": "Attribution %", "value": "Attributed $"
+            })[[
+                "Partner", "Role(s)", "Touchpoints", "Attribution %",
+                "Attributed $", "Rule Applied", "Calculated"
+            ]]
 
-            import plotly.express as px
-            fig = px.pie(
-                attribution_chart_df,
-                values='Value',
-                names='Partner',
-                title=f"Attribution Split - {selected_target.external_id}",
-                hole=0.4
+            st.dataframe(
+                attribution_display,
+                width='stretch',
+                hide_index=True,
+                column_config={
+                    "Attribution %": st.column_config.NumberColumn(format="percent"),
+                    "Attributed $": st.column_config.NumberColumn(format="dollar"),
+                    "Calculated": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm"),
+                },
             )
-            st.plotly_chart(fig, width='stretch')
+
+            # Visualization — skip figure generation when a pie adds no value
+            if len(deal_ledger) >= 2 and total_attributed > 0:
+                st.markdown("#### Attribution Split Visualization")
+
+                # Reuse the breakdown frame rather than re-traversing the ledger
+                fig = build_pie_figure(
+                    selected_target.external_id,
+                    tuple(zip(attribution_display["Partner"],
+                              attribution_display["Attributed $"]))
+                )
+                st.plotly_chart(fig, width='stretch')
+            else:
+                st.info("Split visualization needs at least two partners with attributed value.")
 
             # Audit Trail
             with st.expander("🔍 View Detailed Audit Trail"):
-                st.markdown("**Calculation Logic:**")
-                for entry in deal_ledger:
-                    rule = next((r for r in st.session_state.rules if r.id == entry.rule_id), None)
-                    if rule:
-                        st.json({
-                            "partner_id": entry.partner_id,
-                            "rule_name": rule.name,
-                            "model_type": rule.model_type.value,
-                            "config": rule.config,
-                            "split_percentage": entry.split_percentage,
-                            "attributed_value": entry.attributed_value,
-                            "audit_trail": entry.audit_trail
-                        })
+                # Expander bodies run even when collapsed; the toggle keeps the
+                # payload build off the rerun path until it is requested
+                if st.toggle("Show calculation logic",
+                             key=f"audit_open_{selected_target_id}"):
+                    st.markdown("**Calculation Logic:**")
+                    # One st.json call instead of one frontend message per entry
+                    audit_payload = []
+                    for entry in deal_ledger:
+                        rule = st.session_state.rules.get(entry.rule_id)
+                        if rule:
+                            audit_payload.append({
+                                "partner_id": entry.partner_id,
+                                "rule_name": rule.name,
+                                "model_type": rule.model_type.value,
+                                "config": rule.config,
+                                "split_percentage": entry.split_percentage,
+                                "attributed_value": entry.attributed_value,
+                                "audit_trail": entry.audit_trail
+                            })
+                    st.json(audit_payload)
 
         else:
             st.warning("No attribution calculated for this deal. Run attribution calculation in the Ledger Explorer tab.")
@@ -3083,31 +3386,36 @@ with tabs[4]:
                 with st.form(key=f"override_form_{selected_target_id}"):
                     st.markdown("Adjust the split percentages below. They must sum to 100%.")
 
-                    override_splits = {}
-                    total_percentage = 0
-
-                    for entry in sorted(deal_ledger, key=lambda e: e.attributed_value, reverse=True):
-                        partner_name = st.session_state.partners.get(entry.partner_id, entry.partner_id)
-                        current_percent = entry.split_percentage * 100
-
-                        override_col1, override_col2 = st.columns([3, 1])
-
-                        with override_col1:
-                            st.markdown(f"**{partner_name}** ({entry.partner_id})")
-
-                        with override_col2:
-                            new_percent = st.number_input(
-                                f"Split % for {partner_name}",
-                                min_value=0.0,
-                                max_value=100.0,
-                                value=current_percent,
-                                step=0.1,
-                                format="%.1f",
-                                key=f"override_{entry.partner_id}_{selected_target_id}_{entry.id}",
-                                label_visibility="collapsed"
+                    # One data_editor grid instead of a widget pair per partner
+                    override_entries = sorted(
+                        deal_ledger, key=attrgetter('attributed_value'), reverse=True
+                    )
+                    override_editor_df = pd.DataFrame({
+                        "Partner": [partner_display.get(e.partner_id, e.partner_id)
+                                    for e in override_entries],
+                        "Partner ID": [e.partner_id for e in override_entries],
+                        "Split %": [e.split_percentage * 100 for e in override_entries],
+                    })
+                    edited_splits = st.data_editor(
+                        override_editor_df,
+                        disabled=["Partner", "Partner ID"],
+                        num_rows="fixed",
+                        hide_index=True,
+                        width='stretch',
+                        key=f"override_editor_{selected_target_id}",
+                        column_config={
+                            "Split %": st.column_config.NumberColumn(
+                                min_value=0.0, max_value=100.0,
+                                step=0.1, format="%.1f"
                             )
-                            override_splits[entry.partner_id] = new_percent / 100.0
-                            total_percentage += new_percent
+                        },
+                    )
+                    override_splits = {
+                        pid: pct / 100.0
+                        for pid, pct in zip(edited_splits["Partner ID"],
+                                            edited_splits["Split %"])
+                    }
+                    total_percentage = float(edited_splits["Split %"].sum())
 
                     # Show total validation
                     if abs(total_percentage - 100.0) > 0.1:
@@ -3142,16 +3450,28 @@ with tabs[4]:
                     # Apply manual overrides
                     current_user = "admin"  # TODO: Replace with actual user when auth is implemented
 
-                    # Remove old ledger entries for this deal
-                    st.session_state.ledger = [e for e in st.session_state.ledger if e.target_id != selected_target_id]
+                    # Remove old ledger entries for this deal using the cached
+                    # per-target index: one pass over the ledger, id-set membership
+                    deleted_ids = {e.id for e in deal_ledger}
+                    st.session_state.ledger = [
+                        e for e in st.session_state.ledger if e.id not in deleted_ids
+                    ]
+
+                    # Monotonic counter: O(1) per submit instead of a full ledger scan
+                    if 'next_ledger_id' not in st.session_state:
+                        st.session_state.next_ledger_id = max(
+                            (e.id for e in st.session_state.ledger), default=0
+                        ) + 1
+                    next_ledger_id = st.session_state.next_ledger_id
 
-                    # Create new ledger entries with manual override
-                    next_ledger_id = max([e.id for e in st.session_state.ledger], default=0) + 1
+                    # Original entries indexed by partner for O(1) lookup
+                    orig_by_partner = {e.partner_id: e for e in deal_ledger}
 
+                    new_entries = []
                     for partner_id, split_pct in override_splits.items():
                         if split_pct > 0:  # Only create entries for non-zero splits
                             # Find original entry to get rule_id
-                            original_entry = next((e for e in deal_ledger if e.partner_id == partner_id), None)
+                            original_entry = orig_by_partner.get(partner_id)
                             rule_id = original_entry.rule_id if original_entry else 0
 
                             override_entry = LedgerEntry(
@@ -3169,12 +3489,17 @@ with tabs[4]:
                                     "override_by": current_user,
                                     "override_reason": override_reason,
                                     "override_timestamp": datetime.now().isoformat(),
-                                    "original_split": next((e.split_percentage for e in deal_ledger if e.partner_id == partner_id), None)
+                                    "original_split": original_entry.split_percentage if original_entry else None
                                 }
                             )
 
-                            st.session_state.ledger.append(override_entry)
+                            new_entries.append(override_entry)
                             next_ledger_id += 1
+                    st.session_state.ledger.extend(new_entries)
+                    st.session_state.next_ledger_id = next_ledger_id
+                    # The ledger changed outside the recompute; drop the memo
+                    # so the next recalculation runs instead of early-returning
+                    st.session_state.pop("_attribution_fingerprint", None)
 
                     st.success(f"✅ Manual override applied! {len([s for s in override_splits.values() if s > 0])} partners updated.")
                     st.balloons()
@@ -3195,10 +3520,12 @@ with tabs[4]:
 
             with export_col2:
                 # Generate simple CSV export for now
-                deal_export_df = pd.DataFrame(attribution_data) if deal_ledger else pd.DataFrame()
+                deal_export_df = attribution_display if deal_ledger else pd.DataFrame()
 
                 if not deal_export_df.empty:
-                    csv_data = deal_export_df.to_csv(index=False).encode('utf-8')
+                    csv_data = render_deal_csv(
+                        selected_target_id, _ledger_token(deal_ledger), deal_export_df
+                    )
                     st.download_button(
                         "📥 Download CSV",
                         data=csv_data,
@@ -3240,28 +3567,38 @@ with tabs[12]:
     if st.session_state.ledger:
         st.markdown(f"### Ledger Entries ({len(st.session_state.ledger)})")
 
-        ledger_df = pd.DataFrame([
-            {
-                "ID": entry.id,
-                "Target ID": entry.target_id,
-                "Partner": st.session_state.partners.get(entry.partner_id, entry.partner_id),
-                "Attributed Value": f"${entry.attributed_value:,.2f}",
-                "Split %": f"{entry.split_percentage:.1%}",
-                "Rule ID": entry.rule_id,
-                "Timestamp": entry.calculation_timestamp.strftime("%Y-%m-%d %H:%M")
-            }
-            for entry in st.session_state.ledger[-100:]  # Show last 100
-        ])
+        # Slice first, keep columns numeric, let the client do the formatting
+        tail_entries = st.session_state.ledger[-100:]  # Show last 100
+        ledger_df = pd.DataFrame.from_records(
+            [
+                (entry.id, entry.target_id, entry.partner_id,
+                 entry.attributed_value, entry.split_percentage,
+                 entry.rule_id, entry.calculation_timestamp)
+                for entry in tail_entries
+            ],
+            columns=["ID", "Target ID", "Partner", "Attributed Value",
+                     "Split %", "Rule ID", "Timestamp"]
+        )
+        ledger_df["Partner"] = (
+            ledger_df["Partner"].map(st.session_state.partners).fillna(ledger_df["Partner"])
+        )
 
-        st.dataframe(ledger_df, width='stretch')
+        st.dataframe(
+            ledger_df,
+            width='stretch',
+            column_config={
+                "Attributed Value": st.column_config.NumberColumn(format="dollar"),
+                "Split %": st.column_config.NumberColumn(format="percent"),
+                "Timestamp": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm"),
+            },
+        )
 
-        # Export ledger
+        # Export ledger (streamed row-by-row, no intermediate DataFrame)
         if st.button("Download Full Ledger (CSV)"):
-            full_df = pd.DataFrame([e.to_dict() for e in st.session_state.ledger])
-            csv = full_df.to_csv(index=False).encode("utf-8")
+            csv_bytes = b"".join(stream_ledger_csv(st.session_state.ledger))
             st.download_button(
                 "Download",
-                data=csv,
+                data=csv_bytes,
                 file_name=f"ledger_{date.today()}.csv",
                 mime="text/csv"
             )
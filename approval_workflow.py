@@ -8,13 +8,90 @@ deal registrations, and self-reported activities.
 
 import streamlit as st
 import pandas as pd
+from collections import Counter
 from datetime import datetime, timedelta
+from statistics import fmean
 from typing import List, Dict, Optional
 import plotly.graph_objects as go
 
 from models_new import PartnerTouchpoint, AttributionTarget, DataSource, TouchpointType
 from session_manager import SessionManager
 
+# Enum singletons bound once: identity checks in the hot filter loops
+_DR = DataSource.DEAL_REGISTRATION
+_SR = DataSource.PARTNER_PORTAL_REPORTING
+_MP = DataSource.MARKETPLACE_TRANSACTIONS
+
+# Metadata keys already rendered as dedicated fields on the card
+_KNOWN_META_KEYS = frozenset({
+    'estimated_value', 'expected_close_date', 'deal_stage',
+    'account_name', 'activity_type', 'description', 'submitted_by'
+})
+
+
+@st.cache_data(show_spinner=False)
+def _load_all_touchpoints(version: int, _mgr: SessionManager) -> List[PartnerTouchpoint]:
+    """Fetch all touchpoints, cached until the mutation counter changes.
+
+    The manager is passed unhashed (underscore prefix); the version int is
+    bumped by SessionManager whenever touchpoints are written.
+    """
+    return _mgr.get_all_touchpoints()
+
+
+@st.cache_data(show_spinner=False)
+def _load_pending_approvals(version: int, _mgr: SessionManager) -> List[PartnerTouchpoint]:
+    """Fetch pending approvals, cached on the same mutation counter."""
+    return _mgr.get_pending_approvals()
+
+
+def _touchpoint_version() -> int:
+    """Current touchpoint mutation counter (0 before any write)."""
+    return st.session_state.get("touchpoint_version", 0)
+
+
+@st.cache_data(show_spinner=False)
+def _history_csv(row_ids: tuple, _df: pd.DataFrame) -> str:
+    """Serialize the history table to CSV, cached on the filtered row ids."""
+    return _df.to_csv(index=False)
+
+
+@st.cache_resource(show_spinner=False)
+def _timeline_figure(days: tuple, counts: tuple) -> go.Figure:
+    """Daily review-activity line, cached on its data series."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=list(days),
+        y=list(counts),
+        mode='lines+markers',
+        name='Approvals',
+        line=dict(color='#667eea', width=2),
+        marker=dict(size=8)
+    ))
+    fig.update_layout(
+        title="Daily Approval Activity",
+        xaxis_title="Date",
+        yaxis_title="Number of Reviews",
+        height=400,
+        hovermode='x unified'
+    )
+    return fig
+
+
+@st.cache_resource(show_spinner=False)
+def _source_pie_figure(labels: tuple, values: tuple) -> go.Figure:
+    """Submissions-by-source donut, cached on its data series."""
+    fig = go.Figure(data=[go.Pie(
+        labels=list(labels),
+        values=list(values),
+        hole=0.4
+    )])
+    fig.update_layout(
+        title="Touchpoint Sources",
+        height=400
+    )
+    return fig
+
 
 def render_approval_queue(session_mgr: SessionManager, current_user):
     """Render the approval queue for partner touchpoints."""
@@ -23,13 +100,25 @@ def render_approval_queue(session_mgr: SessionManager, current_user):
     st.caption("Review and approve partner-submitted touchpoints and deal registrations")
 
     # Get pending approvals
-    pending_touchpoints = session_mgr.get_pending_approvals()
+    pending_touchpoints = _load_pending_approvals(_touchpoint_version(), session_mgr)
 
     if not pending_touchpoints:
         st.success("✅ No pending approvals")
         st.info("All partner submissions have been reviewed")
         return
 
+    # Bucket by source in one pass; the metrics and the type filter below
+    # both reuse these lists instead of re-scanning the queue
+    deal_regs, self_reported, marketplace, partner_ids = [], [], [], set()
+    for tp in pending_touchpoints:
+        if tp.source is _DR:
+            deal_regs.append(tp)
+        elif tp.source is _SR:
+            self_reported.append(tp)
+        elif tp.source is _MP:
+            marketplace.append(tp)
+        partner_ids.add(tp.partner_id)
+
     # Summary metrics
     col1, col2, col3 = st.columns(3)
 
@@ -41,7 +130,6 @@ def render_approval_queue(session_mgr: SessionManager, current_user):
         )
 
     with col2:
-        deal_regs = [tp for tp in pending_touchpoints if tp.source == DataSource.DEAL_REGISTRATION]
         st.metric(
             "Deal Registrations",
             len(deal_regs),
@@ -49,7 +137,6 @@ def render_approval_queue(session_mgr: SessionManager, current_user):
         )
 
     with col3:
-        self_reported = [tp for tp in pending_touchpoints if tp.source == DataSource.PARTNER_PORTAL_REPORTING]
         st.metric(
             "Self-Reported Activities",
             len(self_reported),
@@ -71,52 +158,169 @@ def render_approval_queue(session_mgr: SessionManager, current_user):
     with col2:
         filter_partner = st.selectbox(
             "Filter by Partner",
-            ["All"] + sorted(list(set([tp.partner_id for tp in pending_touchpoints]))),
+            ["All", *sorted(partner_ids)],
             key="approval_filter_partner"
         )
 
-    # Apply filters
-    filtered_touchpoints = pending_touchpoints
-
-    if filter_type != "All":
-        if filter_type == "Deal Registrations":
-            filtered_touchpoints = [tp for tp in filtered_touchpoints if tp.source == DataSource.DEAL_REGISTRATION]
-        elif filter_type == "Self-Reported":
-            filtered_touchpoints = [tp for tp in filtered_touchpoints if tp.source == DataSource.PARTNER_PORTAL_REPORTING]
-        elif filter_type == "Marketplace":
-            filtered_touchpoints = [tp for tp in filtered_touchpoints if tp.source == DataSource.MARKETPLACE_TRANSACTIONS]
+    # Apply filters using the pre-bucketed lists
+    if filter_type == "Deal Registrations":
+        filtered_touchpoints = deal_regs
+    elif filter_type == "Self-Reported":
+        filtered_touchpoints = self_reported
+    elif filter_type == "Marketplace":
+        filtered_touchpoints = marketplace
+    else:
+        filtered_touchpoints = pending_touchpoints
 
     if filter_partner != "All":
         filtered_touchpoints = [tp for tp in filtered_touchpoints if tp.partner_id == filter_partner]
 
+    if not filtered_touchpoints:
+        st.info("No touchpoints match the current filters")
+        return
+
     st.markdown(f"### {len(filtered_touchpoints)} Touchpoint(s) to Review")
 
-    # Render each touchpoint as a card
-    for idx, touchpoint in enumerate(filtered_touchpoints):
-        render_touchpoint_card(touchpoint, session_mgr, current_user, idx)
+    # Paginate so rerun cost and payload stay bounded on large queues
+    PAGE_SIZE = 20
+    n_pages = (len(filtered_touchpoints) - 1) // PAGE_SIZE + 1
+    if n_pages > 1:
+        page = st.number_input(
+            f"Page (of {n_pages})", 1, n_pages, 1, key="approval_page"
+        ) - 1
+        filtered_touchpoints = filtered_touchpoints[
+            page * PAGE_SIZE:(page + 1) * PAGE_SIZE
+        ]
+
+    # One data_editor grid for bulk review instead of a card (and its ~10
+    # widgets) per touchpoint; a detail card renders only for the selected row
+    partners_get = st.session_state.partners.get
+    source_labels = {
+        _DR: "Deal Registration",
+        _SR: "Self-Reported",
+        _MP: "Marketplace",
+    }
+    queue_df = pd.DataFrame.from_records([
+        {
+            "ID": tp.id,
+            "Partner": partners_get(tp.partner_id, tp.partner_id),
+            "Role": tp.role,
+            "Source": source_labels.get(tp.source, tp.source.value),
+            "Date": tp.timestamp,
+            "Confidence": tp.source_confidence,
+            "Approve": False,
+            "Reject": False,
+        }
+        for tp in filtered_touchpoints
+    ])
+
+    edited_queue = st.data_editor(
+        queue_df,
+        disabled=["ID", "Partner", "Role", "Source", "Date", "Confidence"],
+        num_rows="fixed",
+        hide_index=True,
+        width='stretch',
+        key="approval_editor",
+        column_config={
+            "Date": st.column_config.DatetimeColumn(format="YYYY-MM-DD"),
+            "Confidence": st.column_config.NumberColumn(format="percent"),
+            "Approve": st.column_config.CheckboxColumn(),
+            "Reject": st.column_config.CheckboxColumn(),
+        },
+    )
+
+    action_col1, action_col2 = st.columns([1, 2])
+
+    with action_col2:
+        bulk_reject_reason = st.text_input(
+            "Rejection reason (required when rejecting)",
+            placeholder="E.g., Duplicate submission, Incorrect account...",
+            key="approval_bulk_reject_reason"
+        )
+
+    with action_col1:
+        if st.button("Apply Decisions", type="primary", width='stretch'):
+            approve_ids = edited_queue.loc[edited_queue["Approve"], "ID"].tolist()
+            reject_ids = edited_queue.loc[
+                edited_queue["Reject"] & ~edited_queue["Approve"], "ID"
+            ].tolist()
+
+            if reject_ids and not bulk_reject_reason:
+                st.error("Please provide a rejection reason")
+            elif not approve_ids and not reject_ids:
+                st.warning("No touchpoints selected")
+            else:
+                for tp_id in approve_ids:
+                    session_mgr.approve_touchpoint(tp_id, approved_by=current_user.email)
+                for tp_id in reject_ids:
+                    session_mgr.reject_touchpoint(
+                        tp_id,
+                        rejected_by=current_user.email,
+                        reason=bulk_reject_reason
+                    )
+                st.success(
+                    f"✅ {len(approve_ids)} approved, ❌ {len(reject_ids)} rejected"
+                )
+                st.rerun()
+
+    # Detail view for a single touchpoint: unique targets fetched once for
+    # the queue rather than per card render
+    target_ids = {tp.target_id for tp in filtered_touchpoints if tp.target_id > 0}
+    targets_by_id = {tid: session_mgr.repo.get_target(tid) for tid in target_ids}
+
+    st.markdown("---")
+    tp_by_label = {
+        f"{partners_get(tp.partner_id, tp.partner_id)} - "
+        f"{source_labels.get(tp.source, tp.source.value)} - {tp.role} (#{tp.id})": tp
+        for tp in filtered_touchpoints
+    }
+    detail_label = st.selectbox(
+        "Inspect touchpoint",
+        list(tp_by_label),
+        index=None,
+        placeholder="Select a touchpoint to see full details...",
+        key="approval_detail_pick"
+    )
+    if detail_label:
+        render_touchpoint_card(
+            tp_by_label[detail_label], session_mgr, current_user, 0, targets_by_id,
+            now=datetime.now()
+        )
+
 
+@st.fragment
+def render_touchpoint_card(touchpoint: PartnerTouchpoint, session_mgr: SessionManager, current_user, idx: int,
+                           targets_by_id: Optional[Dict[int, AttributionTarget]] = None,
+                           now: Optional[datetime] = None):
+    """Render a single touchpoint approval card.
 
-def render_touchpoint_card(touchpoint: PartnerTouchpoint, session_mgr: SessionManager, current_user, idx: int):
-    """Render a single touchpoint approval card."""
+    Runs as a fragment: interactions inside the card rerun only this
+    scope. Approve/reject escalate to a full-app rerun so the queue and
+    metrics refresh.
+    """
 
     # Get the target (opportunity) for context
     target = None
     if touchpoint.target_id > 0:
-        target = session_mgr.repo.get_target(touchpoint.target_id)
+        if targets_by_id is not None:
+            target = targets_by_id.get(touchpoint.target_id)
+        else:
+            target = session_mgr.repo.get_target(touchpoint.target_id)
 
-    # Get partner name
-    partner_name = st.session_state.partners.get(touchpoint.partner_id, touchpoint.partner_id)
+    # Get partner name (bound lookup, consistent with the render loops)
+    partners_get = st.session_state.partners.get
+    partner_name = partners_get(touchpoint.partner_id, touchpoint.partner_id)
 
     # Determine card styling based on source
-    if touchpoint.source == DataSource.DEAL_REGISTRATION:
+    if touchpoint.source is _DR:
         card_emoji = "🎯"
         card_color = "#667eea"
         source_label = "Deal Registration"
-    elif touchpoint.source == DataSource.PARTNER_PORTAL_REPORTING:
+    elif touchpoint.source is _SR:
         card_emoji = "📝"
         card_color = "#48bb78"
         source_label = "Self-Reported"
-    elif touchpoint.source == DataSource.MARKETPLACE_TRANSACTIONS:
+    elif touchpoint.source is _MP:
         card_emoji = "🏪"
         card_color = "#ed8936"
         source_label = "Marketplace"
@@ -137,7 +341,9 @@ def render_touchpoint_card(touchpoint: PartnerTouchpoint, session_mgr: SessionMa
 
         with col2:
             if touchpoint.timestamp:
-                days_ago = (datetime.now() - touchpoint.timestamp).days
+                if now is None:
+                    now = datetime.now()
+                days_ago = (now - touchpoint.timestamp).days
                 st.markdown(f"**Date:** {touchpoint.timestamp.strftime('%Y-%m-%d')}")
                 st.caption(f"({days_ago} days ago)")
 
@@ -163,7 +369,7 @@ def render_touchpoint_card(touchpoint: PartnerTouchpoint, session_mgr: SessionMa
             st.markdown("### 📄 Additional Details")
 
             # Deal registration specific fields
-            if touchpoint.source == DataSource.DEAL_REGISTRATION:
+            if touchpoint.source is _DR:
                 if "estimated_value" in touchpoint.metadata:
                     st.markdown(f"**Estimated Value:** ${touchpoint.metadata['estimated_value']:,.0f}")
                 if "expected_close_date" in touchpoint.metadata:
@@ -172,7 +378,7 @@ def render_touchpoint_card(touchpoint: PartnerTouchpoint, session_mgr: SessionMa
                     st.markdown(f"**Deal Stage:** {touchpoint.metadata['deal_stage']}")
 
             # Self-reported specific fields
-            if touchpoint.source == DataSource.PARTNER_PORTAL_REPORTING:
+            if touchpoint.source is _SR:
                 if "account_name" in touchpoint.metadata:
                     st.markdown(f"**Account:** {touchpoint.metadata['account_name']}")
                 if "activity_type" in touchpoint.metadata:
@@ -184,12 +390,11 @@ def render_touchpoint_card(touchpoint: PartnerTouchpoint, session_mgr: SessionMa
                     st.caption(f"Submitted by: {touchpoint.metadata['submitted_by']}")
 
             # Show all other metadata
-            other_metadata = {
-                k: v for k, v in touchpoint.metadata.items()
-                if k not in ['estimated_value', 'expected_close_date', 'deal_stage',
-                           'account_name', 'activity_type', 'description', 'submitted_by']
-            }
-            if other_metadata:
+            if not _KNOWN_META_KEYS.issuperset(touchpoint.metadata):
+                other_metadata = {
+                    k: v for k, v in touchpoint.metadata.items()
+                    if k not in _KNOWN_META_KEYS
+                }
                 with st.expander("🔍 View All Metadata"):
                     st.json(other_metadata)
 
@@ -210,7 +415,7 @@ def render_touchpoint_card(touchpoint: PartnerTouchpoint, session_mgr: SessionMa
                     approved_by=current_user.email
                 )
                 st.success(f"✅ Approved touchpoint from {partner_name}")
-                st.rerun()
+                st.rerun(scope="app")
 
         with col2:
             if st.button(
@@ -243,14 +448,14 @@ def render_touchpoint_card(touchpoint: PartnerTouchpoint, session_mgr: SessionMa
                             )
                             st.success(f"❌ Rejected touchpoint from {partner_name}")
                             st.session_state[f"show_reject_reason_{touchpoint.id}"] = False
-                            st.rerun()
+                            st.rerun(scope="app")
                         else:
                             st.error("Please provide a rejection reason")
 
                 with col2:
                     if st.form_submit_button("Cancel", use_container_width=True):
                         st.session_state[f"show_reject_reason_{touchpoint.id}"] = False
-                        st.rerun()
+                        st.rerun(scope="app")
 
 
 def render_approval_history(session_mgr: SessionManager):
@@ -260,7 +465,7 @@ def render_approval_history(session_mgr: SessionManager):
     st.caption("View all previously reviewed touchpoints")
 
     # Get all touchpoints (approved and rejected)
-    all_touchpoints = session_mgr.get_all_touchpoints()
+    all_touchpoints = _load_all_touchpoints(_touchpoint_version(), session_mgr)
 
     # Filter to only those that have been reviewed
     reviewed_touchpoints = [
@@ -272,9 +477,15 @@ def render_approval_history(session_mgr: SessionManager):
         st.info("No approval history yet")
         return
 
-    # Summary metrics
-    approved = [tp for tp in reviewed_touchpoints if tp.approved_by]
-    rejected = [tp for tp in reviewed_touchpoints if tp.deal_reg_status == "rejected"]
+    # Bucket by outcome in one pass; metrics, the partner selectbox and the
+    # status filter all reuse these instead of re-scanning the history
+    approved, rejected, partner_ids = [], [], set()
+    for tp in reviewed_touchpoints:
+        if tp.approved_by:
+            approved.append(tp)
+        if tp.deal_reg_status == "rejected":
+            rejected.append(tp)
+        partner_ids.add(tp.partner_id)
 
     col1, col2, col3 = st.columns(3)
 
@@ -309,57 +520,60 @@ def render_approval_history(session_mgr: SessionManager):
     with col3:
         partner_filter = st.selectbox(
             "Partner",
-            ["All"] + sorted(list(set([tp.partner_id for tp in reviewed_touchpoints]))),
+            ["All", *sorted(partner_ids)],
             key="history_partner_filter"
         )
 
-    # Apply filters
-    filtered = reviewed_touchpoints
-
+    # Apply filters: start from the pre-bucketed status list, then combine
+    # the partner and date checks into a single pass
     if status_filter == "Approved":
-        filtered = [tp for tp in filtered if tp.approved_by]
+        filtered = approved
     elif status_filter == "Rejected":
-        filtered = [tp for tp in filtered if tp.deal_reg_status == "rejected"]
-
-    if partner_filter != "All":
-        filtered = [tp for tp in filtered if tp.partner_id == partner_filter]
+        filtered = rejected
+    else:
+        filtered = reviewed_touchpoints
 
-    if date_range and len(date_range) == 2:
-        start_date, end_date = date_range
+    has_date_range = bool(date_range) and len(date_range) == 2
+    start_date, end_date = date_range if has_date_range else (None, None)
+    if partner_filter != "All" or has_date_range:
         filtered = [
             tp for tp in filtered
-            if tp.approval_timestamp and start_date <= tp.approval_timestamp.date() <= end_date
+            if (partner_filter == "All" or tp.partner_id == partner_filter)
+            and (not has_date_range
+                 or (tp.approval_timestamp
+                     and start_date <= tp.approval_timestamp.date() <= end_date))
         ]
 
-    # Build table
-    history_data = []
-    for tp in filtered:
-        partner_name = st.session_state.partners.get(tp.partner_id, tp.partner_id)
-
-        status = "✅ Approved" if tp.approved_by else "❌ Rejected"
-        reviewed_by = tp.approved_by if tp.approved_by else tp.metadata.get('rejected_by', 'Unknown')
-        reviewed_date = tp.approval_timestamp.strftime('%Y-%m-%d %H:%M') if tp.approval_timestamp else "N/A"
-
-        rejection_reason = ""
-        if tp.deal_reg_status == "rejected":
-            rejection_reason = tp.metadata.get('rejection_reason', 'No reason provided')
-
-        history_data.append({
-            "Date": reviewed_date,
-            "Partner": partner_name,
+    # Build table in one comprehension with a bound partner lookup; the
+    # timestamp stays a datetime so nothing downstream has to re-parse it
+    partners_get = st.session_state.partners.get
+    history_data = [
+        {
+            "Date": tp.approval_timestamp,
+            "Partner": partners_get(tp.partner_id, tp.partner_id),
             "Role": tp.role,
             "Source": tp.source.value,
-            "Status": status,
-            "Reviewed By": reviewed_by,
-            "Reason": rejection_reason if rejection_reason else "-"
-        })
+            "Status": "✅ Approved" if tp.approved_by else "❌ Rejected",
+            "Reviewed By": tp.approved_by or tp.metadata.get('rejected_by', 'Unknown'),
+            "Reason": (tp.metadata.get('rejection_reason', 'No reason provided')
+                       if tp.deal_reg_status == "rejected" else "-"),
+        }
+        for tp in filtered
+    ]
 
     if history_data:
-        df = pd.DataFrame(history_data)
-        st.dataframe(df, use_container_width=True, hide_index=True)
+        df = pd.DataFrame.from_records(history_data)
+        st.dataframe(
+            df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Date": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm"),
+            },
+        )
 
-        # Export
-        csv = df.to_csv(index=False)
+        # Export (serialized once per filter result, not per rerun)
+        csv = _history_csv(tuple(tp.id for tp in filtered), df)
         st.download_button(
             "📥 Export History CSV",
             csv,
@@ -375,29 +589,14 @@ def render_approval_history(session_mgr: SessionManager):
         st.markdown("---")
         st.markdown("### 📈 Approval Activity Over Time")
 
-        df['Date_parsed'] = pd.to_datetime(df['Date'])
-        df['Date_only'] = df['Date_parsed'].dt.date
-
-        daily_counts = df.groupby('Date_only').size().reset_index(name='Count')
-
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=daily_counts['Date_only'],
-            y=daily_counts['Count'],
-            mode='lines+markers',
-            name='Approvals',
-            line=dict(color='#667eea', width=2),
-            marker=dict(size=8)
-        ))
-
-        fig.update_layout(
-            title="Daily Approval Activity",
-            xaxis_title="Date",
-            yaxis_title="Number of Reviews",
-            height=400,
-            hovermode='x unified'
+        # Count straight off the touchpoints already in scope - no string
+        # re-parsing or DataFrame roundtrip for a per-day line
+        daily_counts = Counter(
+            tp.approval_timestamp.date() for tp in filtered if tp.approval_timestamp
         )
+        days = sorted(daily_counts)
 
+        fig = _timeline_figure(tuple(days), tuple(daily_counts[d] for d in days))
         st.plotly_chart(fig, use_container_width=True)
 
 
@@ -408,45 +607,53 @@ def render_approval_stats(session_mgr: SessionManager):
     st.caption("Insights into your approval process")
 
     # Get all touchpoints
-    all_touchpoints = session_mgr.get_all_touchpoints()
+    all_touchpoints = _load_all_touchpoints(_touchpoint_version(), session_mgr)
 
-    # Categorize
-    requires_approval = [tp for tp in all_touchpoints if tp.requires_approval]
-    pending = [tp for tp in requires_approval if not tp.approved_by and tp.deal_reg_status != "rejected"]
-    approved = [tp for tp in requires_approval if tp.approved_by]
-    rejected = [tp for tp in requires_approval if tp.deal_reg_status == "rejected"]
+    # Categorize: every counter, the source histogram and the approval
+    # durations come out of one pass over the touchpoints
+    total_submissions = pending_count = approved_count = rejected_count = 0
+    source_counts: Counter = Counter()
+    approval_times = []
+    for tp in all_touchpoints:
+        if not tp.requires_approval:
+            continue
+        total_submissions += 1
+        source_counts[tp.source.value] += 1
+        if tp.approved_by:
+            approved_count += 1
+            if tp.created_at and tp.approval_timestamp:
+                approval_times.append(
+                    (tp.approval_timestamp - tp.created_at).total_seconds() / 3600  # hours
+                )
+        elif tp.deal_reg_status == "rejected":
+            rejected_count += 1
+        else:
+            pending_count += 1
 
     # Summary metrics
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.metric("Total Submissions", len(requires_approval))
+        st.metric("Total Submissions", total_submissions)
 
     with col2:
-        st.metric("Pending", len(pending))
+        st.metric("Pending", pending_count)
 
     with col3:
-        st.metric("Approved", len(approved))
+        st.metric("Approved", approved_count)
 
     with col4:
-        st.metric("Rejected", len(rejected))
+        st.metric("Rejected", rejected_count)
 
     # Approval rate
-    if len(requires_approval) > 0:
-        approval_rate = len(approved) / len(requires_approval)
+    if total_submissions > 0:
+        approval_rate = approved_count / total_submissions
         st.markdown("---")
         st.markdown("### Approval Rate")
         st.progress(approval_rate, text=f"{approval_rate:.1%} of submissions approved")
 
-    # Average time to approval
-    approval_times = []
-    for tp in approved:
-        if tp.created_at and tp.approval_timestamp:
-            time_diff = (tp.approval_timestamp - tp.created_at).total_seconds() / 3600  # hours
-            approval_times.append(time_diff)
-
     if approval_times:
-        avg_time = sum(approval_times) / len(approval_times)
+        avg_time = fmean(approval_times)
         st.markdown("---")
         st.markdown("### Average Time to Approval")
         st.metric("Hours", f"{avg_time:.1f}")
@@ -455,21 +662,8 @@ def render_approval_stats(session_mgr: SessionManager):
     st.markdown("---")
     st.markdown("### Submissions by Source")
 
-    source_counts = {}
-    for tp in requires_approval:
-        source = tp.source.value
-        source_counts[source] = source_counts.get(source, 0) + 1
-
     if source_counts:
-        fig = go.Figure(data=[go.Pie(
-            labels=list(source_counts.keys()),
-            values=list(source_counts.values()),
-            hole=0.4
-        )])
-
-        fig.update_layout(
-            title="Touchpoint Sources",
-            height=400
+        fig = _source_pie_figure(
+            tuple(source_counts), tuple(source_counts.values())
         )
-
         st.plotly_chart(fig, use_container_width=True)
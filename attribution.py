@@ -4,10 +4,21 @@ import json
 import uuid
 import logging
 from datetime import date, datetime, timedelta
+from hashlib import sha1
 from typing import Tuple, Optional, Dict, Any, List
 
 import pandas as pd
 
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        """Serialize with orjson's Rust encoder when it is available."""
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj)
+
 from models import (
     AttributionResult,
     ApplySummary,
@@ -17,6 +28,22 @@ from models import (
 
 logger = logging.getLogger(__name__)
 
+# Sentinel distinguishing "caller did not supply old_split" from "no prior row"
+_UNSET = object()
+
+_UUID_NS_BYTES = uuid.NAMESPACE_DNS.bytes
+
+
+def _event_id(key: str) -> str:
+    """Equivalent of str(uuid.uuid5(NAMESPACE_DNS, key)) with less per-call setup.
+
+    Hashing the precomputed namespace bytes directly skips the attribute
+    lookups and namespace handling uuid5 repeats on every call, which adds
+    up across the per-row id generation in the ledger recompute.
+    """
+    digest = sha1(_UUID_NS_BYTES + key.encode()).digest()
+    return str(uuid.UUID(bytes=digest[:16], version=5))
+
 
 class AttributionEngine:
     """Attribution calculation and management."""
@@ -25,6 +52,30 @@ class AttributionEngine:
         self.db = db
         self.rule_engine = rule_engine
 
+    def _evaluate_rules_cached(
+        self,
+        cache: Dict[tuple, Any],
+        key: str,
+        role: Optional[str],
+        stage: Optional[str],
+        est_val: Optional[float]
+    ):
+        """
+        Evaluate rules with a per-batch memo keyed on (key, role, stage, value).
+
+        Rule evaluation is pure for a given rule version, and real datasets
+        have far fewer distinct contexts than rows, so loops that evaluate
+        per row can share one cache dict for the duration of the batch.
+        """
+        memo_key = (key, role, stage, est_val)
+        result = cache.get(memo_key)
+        if result is None:
+            result = cache[memo_key] = self.rule_engine.evaluate_rules(
+                {"partner_role": role, "stage": stage, "estimated_value": est_val},
+                key=key,
+            )
+        return result
+
     def should_enforce_split_cap(self) -> bool:
         """Check if split cap enforcement is enabled."""
         return self.db.get_setting_bool("enforce_split_cap", default=True)
@@ -41,13 +92,16 @@ class AttributionEngine:
         Returns (exceeds, total_with_new). Excludes current partner's existing
         split when replacing.
         """
-        current = self.db.read_sql("""
-            SELECT partner_id, split_percent
-            FROM account_partners
-            WHERE account_id = ?;
-        """, (account_id,))
+        # A non-positive split can never push the total over the cap,
+        # so skip the SQL round-trip entirely
+        if new_split <= 0:
+            return False, 0.0
 
-        total_other = current[current["partner_id"] != partner_id]["split_percent"].sum()
+        total_other = float(self.db.query_scalar("""
+            SELECT COALESCE(SUM(split_percent), 0)
+            FROM account_partners
+            WHERE account_id = ? AND partner_id <> ?;
+        """, (account_id, partner_id)))
         total_with_new = total_other + float(new_split)
         exceeds = total_with_new > 1.00001  # small tolerance
 
@@ -91,13 +145,15 @@ class AttributionEngine:
         use_case_id: str,
         partner_id: str,
         partner_role: str,
-        split_percent: float
+        split_percent: float,
+        enforce_cap: Optional[bool] = None
     ) -> AttributionResult:
         """
         Upsert account partner relationship from a use case partner link.
 
         This creates/updates both the use_case_partners and account_partners
-        tables, applying business rules and split cap enforcement.
+        tables, applying business rules and split cap enforcement. Batch
+        callers can pass `enforce_cap` to skip the per-call settings read.
         """
         # Find account_id from use case
         uc = self.db.read_sql("SELECT account_id FROM use_cases WHERE use_case_id = ?;", (use_case_id,))
@@ -133,7 +189,9 @@ class AttributionEngine:
                 )
 
         # Check split cap
-        if self.should_enforce_split_cap():
+        if enforce_cap is None:
+            enforce_cap = self.should_enforce_split_cap()
+        if enforce_cap:
             exceeds, total_with_new = self.will_exceed_split_cap(account_id, partner_id, split_percent)
             if exceeds:
                 return AttributionResult(
@@ -177,20 +235,24 @@ class AttributionEngine:
         self,
         account_id: str,
         partner_id: str,
-        split_percent: float
+        split_percent: float,
+        old_split: Any = _UNSET
     ) -> AttributionResult:
         """
         Manually set an account partner split.
 
-        This overrides auto-calculated splits.
+        This overrides auto-calculated splits. Batch importers that already
+        hold the current splits can pass `old_split` (the prior value as a
+        string, or None for a new link) to skip the audit lookup query.
         """
-        # Get old value for audit
-        existing = self.db.read_sql("""
-            SELECT split_percent FROM account_partners
-            WHERE account_id = ? AND partner_id = ?;
-        """, (account_id, partner_id))
+        if old_split is _UNSET:
+            # Get old value for audit
+            existing = self.db.read_sql("""
+                SELECT split_percent FROM account_partners
+                WHERE account_id = ? AND partner_id = ?;
+            """, (account_id, partner_id))
 
-        old_split = str(existing.loc[0, "split_percent"]) if not existing.empty else None
+            old_split = str(existing.loc[0, "split_percent"]) if not existing.empty else None
 
         # Check split cap
         if self.should_enforce_split_cap():
@@ -253,12 +315,20 @@ class AttributionEngine:
         if links.empty:
             return ApplySummary(details=["No links to process."])
 
-        # Get account totals for SI split calculation
-        use_case_vals = self.db.read_sql("SELECT account_id, stage, estimated_value FROM use_cases;")
-        live_totals = use_case_vals[use_case_vals["stage"] == "Live"].groupby("account_id")["estimated_value"].sum()
-        all_totals = use_case_vals.groupby("account_id")["estimated_value"].sum()
+        # Get account totals for SI split calculation, aggregated in SQLite
+        totals = self.db.read_sql("""
+            SELECT account_id,
+                   SUM(CASE WHEN stage = 'Live' THEN COALESCE(estimated_value, 0) ELSE 0 END) AS live_total,
+                   SUM(COALESCE(estimated_value, 0)) AS all_total
+            FROM use_cases
+            GROUP BY account_id;
+        """)
+        live_totals = dict(zip(totals["account_id"], totals["live_total"]))
+        all_totals = dict(zip(totals["account_id"], totals["all_total"]))
 
         si_mode = self.db.get_setting("si_auto_split_mode", "live_share")
+        enforce_cap = self.should_enforce_split_cap()
+        si_fixed = float(self.db.get_setting("si_fixed_percent", "20")) / 100.0
         defaults = {
             "Influence": float(self.db.get_setting("default_split_influence", "10")) / 100.0,
             "Referral": float(self.db.get_setting("default_split_referral", "15")) / 100.0,
@@ -266,48 +336,107 @@ class AttributionEngine:
         }
 
         summary = ApplySummary()
+        rule_cache: Dict[tuple, Any] = {}
+        today = date.today().isoformat()
+        now_iso = datetime.utcnow().isoformat()
+
+        # Snapshot existing links and split totals once so the loop can plan
+        # every write in memory and flush three executemany batches at the end
+        existing_aps = self.db.read_sql(
+            "SELECT account_id, partner_id, source, split_percent FROM account_partners;"
+        )
+        existing_map = {
+            (t.account_id, t.partner_id): (t.source, float(t.split_percent))
+            for t in existing_aps.itertuples(index=False)
+        }
+        split_totals: Dict[str, float] = {}
+        for (acct_key, _), (_, existing_split) in existing_map.items():
+            split_totals[acct_key] = split_totals.get(acct_key, 0.0) + existing_split
+
+        ucp_rows = []
+        ap_rows = []
+        audit_rows = []
 
-        for _, row in links.iterrows():
+        for (use_case_id, partner_id, partner_role, stage,
+             estimated_value, acct, account_name) in links.itertuples(index=False, name=None):
             # Evaluate rules
-            result = self.rule_engine.evaluate_rules({
-                "partner_role": row["partner_role"],
-                "stage": row["stage"],
-                "estimated_value": float(row["estimated_value"] or 0),
-            }, key="account_rules")
+            result = self._evaluate_rules_cached(
+                rule_cache, "account_rules",
+                partner_role, stage, float(estimated_value or 0),
+            )
 
             if not result.allowed:
                 summary.blocked_rule += 1
-                summary.details.append(f"{row['account_name']} / {row['use_case_id']}: {result.message}")
+                summary.details.append(f"{account_name} / {use_case_id}: {result.message}")
+                continue
+
+            ucp_rows.append((use_case_id, partner_id, partner_role, today))
+
+            existing = existing_map.get((acct, partner_id))
+            if existing is not None and existing[0] == "manual":
+                summary.skipped_manual += 1
                 continue
 
             # Calculate split
-            split = defaults.get(row["partner_role"], 0.1)
+            split = defaults.get(partner_role, 0.1)
 
-            if row["partner_role"] == "Implementation (SI)":
-                acct = row["account_id"]
-                uc_value = float(row["estimated_value"] or 0)
+            if partner_role == "Implementation (SI)":
+                uc_value = float(estimated_value or 0)
                 acct_live_total = float(live_totals.get(acct, 0))
                 acct_all_total = float(all_totals.get(acct, 0))
                 auto_split, _ = self.compute_si_auto_split(uc_value, acct_live_total, acct_all_total, si_mode)
                 if auto_split is None:
-                    auto_split = float(self.db.get_setting("si_fixed_percent", "20")) / 100.0
+                    auto_split = si_fixed
                 split = auto_split
 
-            # Upsert
-            upsert_result = self.upsert_account_partner_from_use_case_partner(
-                use_case_id=row["use_case_id"],
-                partner_id=row["partner_id"],
-                partner_role=row["partner_role"],
-                split_percent=split
-            )
-
-            if upsert_result.status == "blocked_split_cap":
+            # Check split cap against the running in-memory totals
+            old_split = existing[1] if existing is not None else None
+            total_other = split_totals.get(acct, 0.0) - (old_split or 0.0)
+            if enforce_cap and total_other + split > 1.00001:
                 summary.blocked_cap += 1
-                summary.details.append(f"{row['account_name']} / {row['use_case_id']}: blocked by split cap.")
-            elif upsert_result.status == "skipped_manual":
-                summary.skipped_manual += 1
-            else:
-                summary.applied += 1
+                summary.details.append(f"{account_name} / {use_case_id}: blocked by split cap.")
+                continue
+
+            ap_rows.append((acct, partner_id, split, today, today))
+            # No audit noise for rows whose auto split did not move
+            if existing is None or existing[0] != "auto" or old_split != split:
+                audit_rows.append((
+                    str(uuid.uuid4()),
+                    now_iso,
+                    "split_updated",
+                    acct,
+                    partner_id,
+                    "split_percent",
+                    str(old_split) if old_split is not None else None,
+                    str(split),
+                    "auto",
+                    json.dumps({"use_case_id": use_case_id, "partner_role": partner_role}),
+                ))
+            split_totals[acct] = total_other + split
+            existing_map[(acct, partner_id)] = ("auto", split)
+            summary.applied += 1
+
+        self.db.run_many("""
+        INSERT INTO use_case_partners(use_case_id, partner_id, partner_role, created_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(use_case_id, partner_id)
+        DO UPDATE SET partner_role = excluded.partner_role;
+        """, ucp_rows)
+
+        self.db.run_many("""
+        INSERT INTO account_partners(account_id, partner_id, split_percent, first_seen, last_seen, source)
+        VALUES (?, ?, ?, ?, ?, 'auto')
+        ON CONFLICT(account_id, partner_id)
+        DO UPDATE SET
+            split_percent = excluded.split_percent,
+            last_seen = excluded.last_seen,
+            source = 'auto';
+        """, ap_rows)
+
+        self.db.run_many("""
+        INSERT INTO audit_trail(audit_id, timestamp, event_type, account_id, partner_id, changed_field, old_value, new_value, source, metadata)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """, audit_rows)
 
         logger.info(f"Auto-assign complete: {summary.applied} applied, {summary.blocked_rule} blocked by rules, {summary.blocked_cap} blocked by cap")
         return summary
@@ -355,75 +484,84 @@ class AttributionEngine:
 
         rule_ver = self.rule_engine.get_rule_version("account_rules")
         result = LedgerResult()
+        event_rows = []
+        rule_cache: Dict[tuple, Any] = {}
+
+        # Hash-join revenues to partners and context once instead of
+        # filtering the partner and context frames per revenue row
+        merged = revenues.merge(aps, on="account_id", how="left")
+        no_partner = merged["partner_id"].isna()
+        result.skipped = int(no_partner.sum())
+        merged = merged[~no_partner].merge(
+            ucp_context.drop_duplicates(["account_id", "partner_id"]),
+            on=["account_id", "partner_id"],
+            how="left",
+        )
 
-        for _, rev in revenues.iterrows():
-            acct_id = rev["account_id"]
-            amount = float(rev["amount"])
-            rev_date = rev["revenue_date"]
-            acct_partners = aps[aps["account_id"] == acct_id]
+        # Do the per-row arithmetic as one array multiply up front
+        merged["amount"] = merged["amount"].astype(float)
+        merged["split_percent"] = merged["split_percent"].astype(float)
+        merged["attributed_amount"] = merged["amount"] * merged["split_percent"]
 
-            if acct_partners.empty:
-                result.skipped += 1
-                continue
+        today_str = date.today().isoformat()
+        make_event_id = _event_id
 
-            for _, ap_row in acct_partners.iterrows():
-                partner_id = ap_row["partner_id"]
-                source = ap_row["source"]
-
-                # Get context for rule evaluation
-                ctx_rows = ucp_context[
-                    (ucp_context["account_id"] == acct_id) & (ucp_context["partner_id"] == partner_id)
-                ]
-                role = ctx_rows["partner_role"].iloc[0] if not ctx_rows.empty else None
-                stage_val = ctx_rows["stage"].iloc[0] if not ctx_rows.empty else None
-                est_val = float(ctx_rows["estimated_value"].iloc[0]) if (not ctx_rows.empty and pd.notnull(ctx_rows["estimated_value"].iloc[0])) else None
-
-                # Evaluate rules (skip for manual entries)
-                allowed = True
-                rule_name = "manual" if source == "manual" else None
-
-                if source != "manual":
-                    eval_result = self.rule_engine.evaluate_rules(
-                        {"partner_role": role, "stage": stage_val, "estimated_value": est_val},
-                        key="account_rules",
-                    )
-                    allowed = eval_result.allowed
-                    rule_name = eval_result.rule_name
-
-                    if not allowed:
-                        result.blocked += 1
-                        continue
-
-                # Create attribution event
-                split = float(ap_row["split_percent"])
-                attr_amount = amount * split
-                event_key = f"{rev_date}-{acct_id}-{partner_id}-{source}"
-                event_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, event_key))
-
-                self.db.run_sql("""
-                    INSERT INTO attribution_events(event_id, revenue_date, account_id, actor_type, actor_id, amount, split_percent, attributed_amount, source, rule_name, rule_version, created_at)
-                    VALUES (?, ?, ?, 'partner', ?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(event_id) DO UPDATE SET
-                        amount=excluded.amount,
-                        split_percent=excluded.split_percent,
-                        attributed_amount=excluded.attributed_amount,
-                        rule_name=excluded.rule_name,
-                        rule_version=excluded.rule_version,
-                        created_at=excluded.created_at;
-                """, (
-                    event_id,
-                    rev_date,
-                    acct_id,
-                    partner_id,
-                    amount,
-                    split,
-                    attr_amount,
-                    source,
-                    rule_name,
-                    rule_ver,
-                    date.today().isoformat(),
-                ))
-                result.inserted += 1
+        for row in merged.itertuples(index=False):
+            acct_id = row.account_id
+            partner_id = row.partner_id
+            source = row.source
+            rev_date = row.revenue_date
+
+            role = row.partner_role if pd.notnull(row.partner_role) else None
+            stage_val = row.stage if pd.notnull(row.stage) else None
+            est_val = float(row.estimated_value) if pd.notnull(row.estimated_value) else None
+
+            # Evaluate rules (skip for manual entries)
+            rule_name = "manual" if source == "manual" else None
+
+            if source != "manual":
+                eval_result = self._evaluate_rules_cached(
+                    rule_cache, "account_rules", role, stage_val, est_val
+                )
+                rule_name = eval_result.rule_name
+
+                if not eval_result.allowed:
+                    result.blocked += 1
+                    continue
+
+            # Create attribution event
+            event_key = "-".join((rev_date, acct_id, partner_id, source))
+            event_id = make_event_id(event_key)
+
+            event_rows.append((
+                event_id,
+                rev_date,
+                acct_id,
+                partner_id,
+                row.amount,
+                row.split_percent,
+                row.attributed_amount,
+                source,
+                rule_name,
+                rule_ver,
+                today_str,
+            ))
+            result.inserted += 1
+
+        # One executemany per 10k-row chunk instead of a commit per row
+        insert_sql = """
+            INSERT INTO attribution_events(event_id, revenue_date, account_id, actor_type, actor_id, amount, split_percent, attributed_amount, source, rule_name, rule_version, created_at)
+            VALUES (?, ?, ?, 'partner', ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(event_id) DO UPDATE SET
+                amount=excluded.amount,
+                split_percent=excluded.split_percent,
+                attributed_amount=excluded.attributed_amount,
+                rule_name=excluded.rule_name,
+                rule_version=excluded.rule_version,
+                created_at=excluded.created_at;
+        """
+        for i in range(0, len(event_rows), 10_000):
+            self.db.run_many(insert_sql, event_rows[i:i + 10_000])
 
         logger.info(f"Ledger recompute complete: {result.inserted} inserted, {result.blocked} blocked, {result.skipped} skipped")
         return result
@@ -438,60 +576,68 @@ class AttributionEngine:
         logger.info(f"Simulating rule impact for {key} over {days} days...")
         window_start = (date.today() - timedelta(days=days)).isoformat()
         results = SimulationResult(target=key, lookback_days=days)
+        rule_cache: Dict[tuple, Any] = {}
 
         if key == "account_rules":
-            aps = self.db.read_sql("""
-                SELECT ap.account_id, ap.partner_id, ap.source, p.partner_name
+            # One server-side join replaces three reads plus Python-side maps:
+            # context is collapsed to one row per (account, partner) and the
+            # ledger window is pre-aggregated before joining
+            joined = self.db.read_sql("""
+                SELECT ap.account_id, ap.partner_id,
+                       c.partner_role, c.stage, c.estimated_value,
+                       COALESCE(l.amt, 0) AS amt,
+                       c.partner_id IS NOT NULL AS has_ctx
                 FROM account_partners ap
-                JOIN partners p ON p.partner_id = ap.partner_id;
-            """)
+                JOIN partners p ON p.partner_id = ap.partner_id
+                LEFT JOIN (
+                    SELECT u.account_id AS account_id, ucp.partner_id AS partner_id,
+                           ucp.partner_role, u.stage, u.estimated_value
+                    FROM use_case_partners ucp
+                    JOIN use_cases u ON u.use_case_id = ucp.use_case_id
+                    GROUP BY u.account_id, ucp.partner_id
+                ) c ON c.account_id = ap.account_id AND c.partner_id = ap.partner_id
+                LEFT JOIN (
+                    SELECT account_id, actor_id, SUM(attributed_amount) AS amt
+                    FROM attribution_events
+                    WHERE revenue_date >= ?
+                    GROUP BY account_id, actor_id
+                ) l ON l.account_id = ap.account_id AND l.actor_id = ap.partner_id;
+            """, (window_start,))
 
-            if aps.empty:
+            if joined.empty:
                 results.details.append("No account partners to evaluate.")
                 return results
 
-            ctx = self.db.read_sql("""
-                SELECT ucp.partner_id, u.account_id, ucp.partner_role, u.stage, u.estimated_value
-                FROM use_case_partners ucp
-                JOIN use_cases u ON u.use_case_id = ucp.use_case_id;
-            """)
-
-            ledger = self.db.read_sql("""
-                SELECT account_id, actor_id, SUM(attributed_amount) AS amt
-                FROM attribution_events
-                WHERE revenue_date >= ?
-                GROUP BY account_id, actor_id;
-            """, (window_start,))
+            results.no_context = int((joined["has_ctx"] == 0).sum())
+            blocked_rows = []
 
-            for _, row in aps.iterrows():
+            for (acct, pid, role, stage_val, raw_est,
+                 amt, has_ctx) in joined.itertuples(index=False, name=None):
                 results.checked += 1
-                acct = row["account_id"]
-                pid = row["partner_id"]
-
-                ctx_rows = ctx[(ctx["account_id"] == acct) & (ctx["partner_id"] == pid)]
-                role = ctx_rows["partner_role"].iloc[0] if not ctx_rows.empty else None
-                stage_val = ctx_rows["stage"].iloc[0] if not ctx_rows.empty else None
-                est_val = float(ctx_rows["estimated_value"].iloc[0]) if (not ctx_rows.empty and pd.notnull(ctx_rows["estimated_value"].iloc[0])) else None
+                if not has_ctx:
+                    role = stage_val = est_val = None
+                else:
+                    role = role if pd.notnull(role) else None
+                    stage_val = stage_val if pd.notnull(stage_val) else None
+                    est_val = float(raw_est) if pd.notnull(raw_est) else None
 
-                eval_result = self.rule_engine.evaluate_rules(
-                    {"partner_role": role, "stage": stage_val, "estimated_value": est_val},
-                    key="account_rules",
+                eval_result = self._evaluate_rules_cached(
+                    rule_cache, "account_rules", role, stage_val, est_val
                 )
 
-                ledger_row = ledger[(ledger["account_id"] == acct) & (ledger["actor_id"] == pid)]
-                amt = float(ledger_row["amt"].iloc[0]) if not ledger_row.empty else 0.0
-
                 if eval_result.allowed:
                     results.allowed += 1
                 else:
+                    amt = float(amt)
                     results.blocked += 1
                     results.revenue_at_risk += amt
-                    results.details.append(
-                        f"{acct}/{pid}: {eval_result.message} (rule={eval_result.rule_name or 'n/a'}, {amt:,.0f} revenue in last {days}d)"
-                    )
+                    blocked_rows.append((acct, pid, eval_result.message, eval_result.rule_name, amt))
 
-                if ctx_rows.empty:
-                    results.no_context += 1
+            # Format details in one pass once the counts are settled
+            results.details.extend(
+                f"{acct}/{pid}: {msg} (rule={rule or 'n/a'}, {amt:,.0f} revenue in last {days}d)"
+                for acct, pid, msg, rule, amt in blocked_rows
+            )
 
         else:  # use_case_rules
             ucp = self.db.read_sql("""
@@ -504,28 +650,27 @@ class AttributionEngine:
                 results.details.append("No use case links to evaluate.")
                 return results
 
-            for _, row in ucp.iterrows():
+            blocked_rows = []
+
+            for (_uc_id, _pid, partner_role, stage, estimated_value,
+                 use_case_name, acct_id) in ucp.itertuples(index=False, name=None):
                 results.checked += 1
-                eval_result = self.rule_engine.evaluate_rules(
-                    {
-                        "partner_role": row["partner_role"],
-                        "stage": row["stage"],
-                        "estimated_value": float(row["estimated_value"] or 0),
-                    },
-                    key="use_case_rules",
+                val = float(estimated_value or 0)
+                eval_result = self._evaluate_rules_cached(
+                    rule_cache, "use_case_rules", partner_role, stage, val,
                 )
 
-                val = float(row["estimated_value"] or 0)
-
                 if eval_result.allowed:
                     results.allowed += 1
                 else:
                     results.blocked += 1
                     results.estimated_value_blocked += val
-                    results.details.append(
-                        f"{row['use_case_name']} ({row['account_id']}): {eval_result.message} "
-                        f"(rule={eval_result.rule_name or 'n/a'}, est value {val:,.0f})"
-                    )
+                    blocked_rows.append((use_case_name, acct_id, eval_result.message, eval_result.rule_name, val))
+
+            results.details.extend(
+                f"{name} ({acct_id}): {msg} (rule={rule or 'n/a'}, est value {val:,.0f})"
+                for name, acct_id, msg, rule, val in blocked_rows
+            )
 
         logger.info(f"Simulation complete: {results.allowed} allowed, {results.blocked} blocked")
         return results
@@ -556,35 +701,38 @@ class AttributionEngine:
         rule_ver_use = self.rule_engine.get_rule_version("use_case_rules")
         rule_ver_account = self.rule_engine.get_rule_version("account_rules")
         written = 0
+        rule_cache: Dict[tuple, Any] = {}
+        now_iso = datetime.utcnow().isoformat()
+        explanation_rows = []
+
+        # Group use case links by partner once instead of rescanning per partner
+        empty_ucp = ucp.iloc[0:0]
+        ucp_by_partner = {pid: grp for pid, grp in ucp.groupby("partner_id", sort=False)}
 
-        for _, ap_row in aps.iterrows():
-            pid = ap_row["partner_id"]
-            uc_links = ucp[ucp["partner_id"] == pid]
+        for pid, raw_split, source in aps.itertuples(index=False, name=None):
+            uc_links = ucp_by_partner.get(pid, empty_ucp)
             uc_items = []
             use_case_decisions = []
 
-            for _, r in uc_links.iterrows():
-                eval_result = self.rule_engine.evaluate_rules(
-                    {
-                        "partner_role": r["partner_role"],
-                        "stage": r["stage"],
-                        "estimated_value": float(r["estimated_value"] or 0),
-                    },
-                    key="use_case_rules",
+            for (_link_pid, link_role, use_case_name,
+                 link_stage, link_value) in uc_links.itertuples(index=False, name=None):
+                eval_result = self._evaluate_rules_cached(
+                    rule_cache, "use_case_rules",
+                    link_role, link_stage, float(link_value or 0),
                 )
 
                 uc_items.append({
-                    "use_case_name": r["use_case_name"],
-                    "role": r["partner_role"],
-                    "stage": r["stage"],
-                    "estimated_value": r["estimated_value"],
+                    "use_case_name": use_case_name,
+                    "role": link_role,
+                    "stage": link_stage,
+                    "estimated_value": link_value,
                     "allowed": eval_result.allowed,
                     "rule_name": eval_result.rule_name,
                     "rule_version": rule_ver_use,
                     "detail": eval_result.message,
                 })
                 use_case_decisions.append({
-                    "use_case": r["use_case_name"],
+                    "use_case": use_case_name,
                     "allowed": eval_result.allowed,
                     "rule_name": eval_result.rule_name
                 })
@@ -595,13 +743,11 @@ class AttributionEngine:
             stage_val = sample_ctx["stage"] if sample_ctx is not None else None
             est_val = float(sample_ctx["estimated_value"] or 0) if sample_ctx is not None else None
 
-            acct_eval = self.rule_engine.evaluate_rules(
-                {"partner_role": role, "stage": stage_val, "estimated_value": est_val},
-                key="account_rules",
+            acct_eval = self._evaluate_rules_cached(
+                rule_cache, "account_rules", role, stage_val, est_val
             )
 
-            source = ap_row["source"]
-            split_percent = float(ap_row["split_percent"])
+            split_percent = float(raw_split)
             split_reason = "Manual split" if source == "manual" else "AI suggested" if source == "ai" else "Auto rollup"
 
             explanation = {
@@ -623,15 +769,17 @@ class AttributionEngine:
                 },
             }
 
-            self.db.run_sql("""
-                INSERT INTO attribution_explanations(account_id, partner_id, as_of_date, explanation_json, created_at)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(account_id, partner_id, as_of_date)
-                DO UPDATE SET explanation_json=excluded.explanation_json, created_at=excluded.created_at;
-            """, (account_id, pid, today_str, json.dumps(explanation, indent=2), datetime.utcnow().isoformat()))
-
+            explanation_rows.append((account_id, pid, today_str, _dumps(explanation), now_iso))
             written += 1
 
+        # One executemany for all partners instead of a commit per upsert
+        self.db.run_many("""
+            INSERT INTO attribution_explanations(account_id, partner_id, as_of_date, explanation_json, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(account_id, partner_id, as_of_date)
+            DO UPDATE SET explanation_json=excluded.explanation_json, created_at=excluded.created_at;
+        """, explanation_rows)
+
         logger.info(f"Wrote {written} explanations for account {account_id}")
         return {"written": written}
 
@@ -592,7 +592,7 @@ class DataSourceIngestion:
 
     def ingest_deal_registrations(
         self,
-        csv_content: bytes,
+        csv_content: Any,
         workflow: Optional[Any] = None,
         target_id_mapping: Optional[Dict[str, int]] = None
     ) -> Dict[str, Any]:
@@ -612,7 +612,8 @@ class DataSourceIngestion:
         - approval_date: When approved
 
         Args:
-            csv_content: CSV file content as bytes
+            csv_content: CSV file content as bytes, or a file-like object
+                (e.g. Streamlit's UploadedFile) which is streamed in chunks
             workflow: Optional MeasurementWorkflow for validation rules
             target_id_mapping: Optional dict mapping external_id → target_id
 
@@ -627,19 +628,17 @@ class DataSourceIngestion:
         from models_new import DataSource
 
         try:
-            # Parse CSV
-            df = pd.read_csv(io.BytesIO(csv_content))
-
-            # Validate required columns
-            required_cols = ["deal_reg_id", "partner_id", "opportunity_id", "submitted_date"]
-            missing_cols = [col for col in required_cols if col not in df.columns]
-            if missing_cols:
-                raise ValueError(f"Missing required columns: {missing_cols}")
+            # Stream-parse: accept a file-like object directly so large
+            # uploads aren't copied into an extra bytes buffer first.
+            if isinstance(csv_content, (bytes, bytearray)):
+                csv_content = io.BytesIO(csv_content)
+            elif hasattr(csv_content, "seek"):
+                csv_content.seek(0)
 
             touchpoints = []
             warnings = []
             stats = {
-                "total_rows": len(df),
+                "total_rows": 0,
                 "touchpoints_created": 0,
                 "skipped_rows": 0,
                 "by_status": {}
@@ -656,60 +655,70 @@ class DataSourceIngestion:
                 if deal_reg_config:
                     require_approval = deal_reg_config.config.get("require_approval", False)
 
-            for idx, row in df.iterrows():
-                try:
-                    # Parse submitted date
-                    submitted_date = pd.to_datetime(row["submitted_date"])
-
-                    # Determine target_id
-                    target_id = 0  # Placeholder (will be resolved by caller)
-                    if target_id_mapping and row["opportunity_id"] in target_id_mapping:
-                        target_id = target_id_mapping[row["opportunity_id"]]
-
-                    # Get status (default to pending)
-                    status = row.get("status", "pending")
-                    stats["by_status"][status] = stats["by_status"].get(status, 0) + 1
-
-                    # Create touchpoint
-                    touchpoint = PartnerTouchpoint(
-                        id=0,  # Will be assigned by database
-                        partner_id=str(row["partner_id"]),
-                        target_id=target_id,
-                        touchpoint_type=TouchpointType.DEAL_REGISTRATION,
-                        role=row.get("partner_role", "Referral"),
-                        weight=1.0,
-                        timestamp=submitted_date,
-
-                        # Source tracking (Phase 1.3)
-                        source=DataSource.DEAL_REGISTRATION,
-                        source_id=str(row["deal_reg_id"]),
-                        source_confidence=1.0,  # Deal reg is definitive
-
-                        # Deal registration fields
-                        deal_reg_status=status,
-                        deal_reg_submitted_date=submitted_date,
-                        deal_reg_approved_date=pd.to_datetime(row["approval_date"]) if "approval_date" in row and pd.notna(row["approval_date"]) else None,
-
-                        # Approval workflow
-                        requires_approval=require_approval,
-                        approved_by=row.get("approved_by") if "approved_by" in row else None,
-                        approval_timestamp=pd.to_datetime(row["approval_date"]) if "approval_date" in row and pd.notna(row["approval_date"]) else None,
-
-                        # Metadata
-                        metadata={
-                            "opportunity_id": row["opportunity_id"],
-                            "estimated_value": float(row["estimated_value"]) if "estimated_value" in row and pd.notna(row["estimated_value"]) else None,
-                            "notes": row.get("notes")
-                        },
-                        created_at=datetime.now()
-                    )
-
-                    touchpoints.append(touchpoint)
-                    stats["touchpoints_created"] += 1
-
-                except Exception as e:
-                    warnings.append(f"Row {idx + 1}: {str(e)}")
-                    stats["skipped_rows"] += 1
+            required_cols = ["deal_reg_id", "partner_id", "opportunity_id", "submitted_date"]
+
+            for df in pd.read_csv(csv_content, chunksize=10_000):
+                # Validate required columns (same header on every chunk)
+                missing_cols = [col for col in required_cols if col not in df.columns]
+                if missing_cols:
+                    raise ValueError(f"Missing required columns: {missing_cols}")
+
+                stats["total_rows"] += len(df)
+
+                for idx, row in df.iterrows():
+                    try:
+                        # Parse submitted date
+                        submitted_date = pd.to_datetime(row["submitted_date"])
+
+                        # Determine target_id
+                        target_id = 0  # Placeholder (will be resolved by caller)
+                        if target_id_mapping and row["opportunity_id"] in target_id_mapping:
+                            target_id = target_id_mapping[row["opportunity_id"]]
+
+                        # Get status (default to pending)
+                        status = row.get("status", "pending")
+                        stats["by_status"][status] = stats["by_status"].get(status, 0) + 1
+
+                        # Create touchpoint
+                        touchpoint = PartnerTouchpoint(
+                            id=0,  # Will be assigned by database
+                            partner_id=str(row["partner_id"]),
+                            target_id=target_id,
+                            touchpoint_type=TouchpointType.DEAL_REGISTRATION,
+                            role=row.get("partner_role", "Referral"),
+                            weight=1.0,
+                            timestamp=submitted_date,
+
+                            # Source tracking (Phase 1.3)
+                            source=DataSource.DEAL_REGISTRATION,
+                            source_id=str(row["deal_reg_id"]),
+                            source_confidence=1.0,  # Deal reg is definitive
+
+                            # Deal registration fields
+                            deal_reg_status=status,
+                            deal_reg_submitted_date=submitted_date,
+                            deal_reg_approved_date=pd.to_datetime(row["approval_date"]) if "approval_date" in row and pd.notna(row["approval_date"]) else None,
+
+                            # Approval workflow
+                            requires_approval=require_approval,
+                            approved_by=row.get("approved_by") if "approved_by" in row else None,
+                            approval_timestamp=pd.to_datetime(row["approval_date"]) if "approval_date" in row and pd.notna(row["approval_date"]) else None,
+
+                            # Metadata
+                            metadata={
+                                "opportunity_id": row["opportunity_id"],
+                                "estimated_value": float(row["estimated_value"]) if "estimated_value" in row and pd.notna(row["estimated_value"]) else None,
+                                "notes": row.get("notes")
+                            },
+                            created_at=datetime.now()
+                        )
+
+                        touchpoints.append(touchpoint)
+                        stats["touchpoints_created"] += 1
+
+                    except Exception as e:
+                        warnings.append(f"Row {idx + 1}: {str(e)}")
+                        stats["skipped_rows"] += 1
 
             return {
                 "touchpoints": touchpoints,
@@ -23,8 +23,15 @@ class Database:
         self.db_path = db_path
 
     def get_conn(self) -> sqlite3.Connection:
-        """Get a database connection."""
-        return sqlite3.connect(self.db_path, check_same_thread=False)
+        """Get a database connection with write-friendly pragmas applied."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL amortizes the per-commit fsync that dominates small writes;
+        # the remaining pragmas are per-connection tuning for batch paths
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute("PRAGMA temp_store=MEMORY;")
+        conn.execute("PRAGMA cache_size=-65536;")
+        return conn
 
     def run_sql(self, sql: str, params: tuple = ()) -> None:
         """Execute a SQL statement that modifies data."""
@@ -39,6 +46,32 @@ class Database:
             logger.error(f"Error executing SQL: {e}")
             raise
 
+    def run_many(self, sql: str, rows: list) -> None:
+        """Execute one statement for many parameter rows in a single transaction."""
+        if not rows:
+            return
+        try:
+            conn = self.get_conn()
+            conn.executemany(sql, rows)
+            conn.commit()
+            conn.close()
+            logger.debug(f"Executed SQL batch: {sql[:100]}... with {len(rows)} rows")
+        except Exception as e:
+            logger.error(f"Error executing SQL batch: {e}")
+            raise
+
+    def query_scalar(self, sql: str, params: tuple = ()):
+        """Execute a query that returns a single value (e.g. an aggregate)."""
+        try:
+            conn = self.get_conn()
+            row = conn.cursor().execute(sql, params).fetchone()
+            conn.close()
+            logger.debug(f"Scalar SQL: {sql[:100]}... with params {params}")
+            return row[0] if row else None
+        except Exception as e:
+            logger.error(f"Error executing scalar SQL: {e}")
+            raise
+
     def read_sql(self, sql: str, params: tuple = ()) -> pd.DataFrame:
         """Execute a SQL query and return results as DataFrame."""
         try:
@@ -146,6 +179,11 @@ class Database:
 
         self.run_sql("CREATE UNIQUE INDEX IF NOT EXISTS idx_attr_events_unique ON attribution_events(revenue_date, account_id, actor_id, source);")
 
+        self.run_sql("CREATE INDEX IF NOT EXISTS idx_uc_account ON use_cases(account_id);")
+        self.run_sql("CREATE INDEX IF NOT EXISTS idx_ucp_partner ON use_case_partners(partner_id);")
+        self.run_sql("CREATE INDEX IF NOT EXISTS idx_rev_date_account ON revenue_events(revenue_date, account_id);")
+        self.run_sql("CREATE INDEX IF NOT EXISTS idx_attr_events_acct_actor ON attribution_events(account_id, actor_id);")
+
         self.run_sql("""
         CREATE TABLE IF NOT EXISTS attribution_explanations (
             account_id TEXT NOT NULL,
@@ -136,7 +136,7 @@ DEFAULT_PARTNER_ROLES = [
 # Data Classes
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class AttributionTarget:
     """
     What gets credit - an opportunity, consumption event, or account.
@@ -183,7 +183,7 @@ class AttributionTarget:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class PartnerTouchpoint:
     """
     Evidence of partner involvement with a target.
@@ -473,7 +473,7 @@ class AttributionRule:
         return True
 
 
-@dataclass
+@dataclass(slots=True)
 class LedgerEntry:
     """
     Immutable attribution result - output of the calculation engine.
@@ -39,7 +39,8 @@ class SessionManager:
 
         # Load rules
         if "rules" not in st.session_state:
-            st.session_state.rules = self.repo.get_all_rules()
+            # Keyed by rule id for O(1) lookup, update, and delete
+            st.session_state.rules = {r.id: r for r in self.repo.get_all_rules()}
 
         # Load ledger
         if "ledger" not in st.session_state:
@@ -51,7 +52,8 @@ class SessionManager:
 
         # Load workflows
         if "workflows" not in st.session_state:
-            st.session_state.workflows = self.repo.get_all_workflows()
+            # Keyed by workflow id, mirroring the rules store
+            st.session_state.workflows = {w.id: w for w in self.repo.get_all_workflows()}
 
         # Initialize filters (UI state only, not persisted)
         if "global_filters" not in st.session_state:
@@ -130,6 +132,14 @@ class SessionManager:
     # Touchpoint Operations
     # ========================================================================
 
+
+    @staticmethod
+    def _bump_touchpoint_version() -> None:
+        """Invalidate caches keyed on the touchpoint mutation counter."""
+        st.session_state.touchpoint_version = (
+            st.session_state.get("touchpoint_version", 0) + 1
+        )
+
     def add_touchpoint(self, touchpoint: PartnerTouchpoint) -> int:
         """Add a touchpoint to database and session state."""
         # Create in database
@@ -140,6 +150,7 @@ class SessionManager:
 
         # Add to session state
         st.session_state.touchpoints.append(touchpoint)
+        self._bump_touchpoint_version()
 
         return touchpoint_id
 
@@ -153,6 +164,7 @@ class SessionManager:
             st.session_state.touchpoints.append(tp)
             touchpoint_ids.append(tp_id)
 
+        self._bump_touchpoint_version()
         return touchpoint_ids
 
     def update_touchpoint(self, touchpoint: PartnerTouchpoint):
@@ -165,6 +177,7 @@ class SessionManager:
             if tp.id == touchpoint.id:
                 st.session_state.touchpoints[i] = touchpoint
                 break
+        self._bump_touchpoint_version()
 
     def delete_touchpoint(self, touchpoint_id: int):
         """Delete a touchpoint from database and session state."""
@@ -175,6 +188,7 @@ class SessionManager:
         st.session_state.touchpoints = [
             tp for tp in st.session_state.touchpoints if tp.id != touchpoint_id
         ]
+        self._bump_touchpoint_version()
 
     def approve_touchpoint(self, touchpoint_id: int, approved_by: str):
         """Approve a touchpoint."""
@@ -211,6 +225,7 @@ class SessionManager:
     def reload_touchpoints(self):
         """Reload all touchpoints from database."""
         st.session_state.touchpoints = self.repo.get_all_touchpoints()
+        self._bump_touchpoint_version()
 
     # ========================================================================
     # Rule Operations
@@ -225,7 +240,7 @@ class SessionManager:
         rule.id = rule_id
 
         # Add to session state
-        st.session_state.rules.append(rule)
+        st.session_state.rules[rule.id] = rule
 
         return rule_id
 
@@ -235,10 +250,7 @@ class SessionManager:
         self.repo.update_rule(rule)
 
         # Update in session state
-        for i, r in enumerate(st.session_state.rules):
-            if r.id == rule.id:
-                st.session_state.rules[i] = rule
-                break
+        st.session_state.rules[rule.id] = rule
 
     def delete_rule(self, rule_id: int):
         """Delete a rule from database and session state."""
@@ -246,13 +258,11 @@ class SessionManager:
         self.repo.delete_rule(rule_id)
 
         # Remove from session state
-        st.session_state.rules = [
-            r for r in st.session_state.rules if r.id != rule_id
-        ]
+        st.session_state.rules.pop(rule_id, None)
 
     def reload_rules(self):
         """Reload all rules from database."""
-        st.session_state.rules = self.repo.get_all_rules()
+        st.session_state.rules = {r.id: r for r in self.repo.get_all_rules()}
 
     # ========================================================================
     # Ledger Operations
@@ -308,7 +318,7 @@ class SessionManager:
         workflow.id = workflow_id
 
         # Add to session state
-        st.session_state.workflows.append(workflow)
+        st.session_state.workflows[workflow.id] = workflow
 
         return workflow_id
 
@@ -318,10 +328,7 @@ class SessionManager:
         self.repo.update_workflow(workflow)
 
         # Update in session state
-        for i, w in enumerate(st.session_state.workflows):
-            if w.id == workflow.id:
-                st.session_state.workflows[i] = workflow
-                break
+        st.session_state.workflows[workflow.id] = workflow
 
     def delete_workflow(self, workflow_id: int):
         """Delete a workflow from database and session state."""
@@ -329,13 +336,11 @@ class SessionManager:
         self.repo.delete_workflow(workflow_id)
 
         # Remove from session state
-        st.session_state.workflows = [
-            w for w in st.session_state.workflows if w.id != workflow_id
-        ]
+        st.session_state.workflows.pop(workflow_id, None)
 
     def reload_workflows(self):
         """Reload all workflows from database."""
-        st.session_state.workflows = self.repo.get_all_workflows()
+        st.session_state.workflows = {w.id: w for w in self.repo.get_all_workflows()}
 
     # ========================================================================
     # Partner Operations
@@ -399,7 +404,7 @@ class SessionManager:
                 continue
 
             # Select rule
-            rule = select_rule_for_target(target, st.session_state.rules)
+            rule = select_rule_for_target(target, list(st.session_state.rules.values()))
             if not rule:
                 continue
 
@@ -439,6 +444,7 @@ class SessionManager:
                 tp.approved_by = approved_by
                 tp.approval_timestamp = datetime.now()
                 break
+        self._bump_touchpoint_version()
 
     def reject_touchpoint(self, touchpoint_id: int, rejected_by: str, reason: str) -> None:
         """Reject a touchpoint."""
@@ -453,3 +459,4 @@ class SessionManager:
                 tp.metadata['rejected_by'] = rejected_by
                 tp.metadata['rejection_reason'] = reason
                 break
+        self._bump_touchpoint_version()